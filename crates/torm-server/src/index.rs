@@ -0,0 +1,279 @@
+//! Secondary indexes on numeric document fields
+//!
+//! An index on `collection.field` is a sorted set `torm:index:{collection}:{field}`
+//! that scores every document key by the field's value. Queries that
+//! compare an indexed field against a number read candidate keys with
+//! ZRANGEBYSCORE instead of scanning every key in the collection.
+//!
+//! Indexes are kept up to date by the REST write handlers: once a field is
+//! in the registry set `torm:indexes:{collection}`, every write updates its
+//! sorted set in the same MULTI/EXEC as the write itself. A field is
+//! registered before its index is backfilled, and stays in
+//! `torm:indexes:building:{collection}` until the backfill has finished;
+//! queries ignore it until then. Keys written around the API (e.g. from
+//! the studio) are not indexed.
+
+use crate::query::Filter;
+use redis::aio::ConnectionManager;
+use redis::RedisResult;
+use serde_json::Value;
+
+/// Keys read per SCAN step while backfilling an index
+const BACKFILL_BATCH_SIZE: usize = 500;
+
+fn registry_key(collection: &str) -> String {
+    format!("torm:indexes:{}", collection)
+}
+
+fn building_key(collection: &str) -> String {
+    format!("torm:indexes:building:{}", collection)
+}
+
+fn index_key(collection: &str, field: &str) -> String {
+    format!("torm:index:{}:{}", collection, field)
+}
+
+/// Fields of a collection whose index is complete and can answer queries
+async fn ready_fields(conn: &mut ConnectionManager, collection: &str) -> RedisResult<Vec<String>> {
+    let (registered, building): (Vec<String>, Vec<String>) = redis::pipe()
+        .cmd("SMEMBERS")
+        .arg(registry_key(collection))
+        .cmd("SMEMBERS")
+        .arg(building_key(collection))
+        .query_async(conn)
+        .await?;
+    Ok(registered
+        .into_iter()
+        .filter(|field| !building.contains(field))
+        .collect())
+}
+
+/// Registers a field, emptying any leftover index and marking it as
+/// building. Returns 1 while the index still needs a backfill.
+const REGISTER_SCRIPT: &str = r#"
+if redis.call('SADD', KEYS[1], ARGV[1]) == 1 then
+    redis.call('DEL', KEYS[3])
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+return redis.call('SISMEMBER', KEYS[2], ARGV[1])
+"#;
+
+/// Create the index on `field` from the current documents.
+///
+/// Idempotent: a finished index is kept as is, since the write handlers
+/// maintain it, and an interrupted backfill is resumed. The backfill walks
+/// the collection with SCAN so Redis keeps serving other clients. Returns
+/// the number of indexed documents.
+pub async fn build_index(
+    conn: &mut ConnectionManager,
+    collection: &str,
+    field: &str,
+) -> RedisResult<usize> {
+    let index = index_key(collection, field);
+    let building: bool = redis::Script::new(REGISTER_SCRIPT)
+        .key(registry_key(collection))
+        .key(building_key(collection))
+        .key(&index)
+        .arg(field)
+        .invoke_async(conn)
+        .await?;
+
+    if building {
+        let pattern = format!("{}:*", collection);
+        let mut cursor: u64 = 0;
+        loop {
+            let (next, keys): (u64, Vec<String>) = redis::cmd("SCAN")
+                .arg(cursor)
+                .arg("MATCH")
+                .arg(&pattern)
+                .arg("COUNT")
+                .arg(BACKFILL_BATCH_SIZE)
+                .query_async(conn)
+                .await?;
+
+            if !keys.is_empty() {
+                let values: Vec<Option<String>> =
+                    redis::cmd("MGET").arg(&keys).query_async(conn).await?;
+                // NX keeps any score a concurrent write has set since the MGET
+                let mut pipe = redis::pipe();
+                for (key, value) in keys.iter().zip(values) {
+                    let score = value
+                        .and_then(|value| serde_json::from_str::<Value>(&value).ok())
+                        .and_then(|doc| doc.get(field).and_then(Value::as_f64));
+                    if let Some(score) = score {
+                        pipe.cmd("ZADD")
+                            .arg(&index)
+                            .arg("NX")
+                            .arg(score)
+                            .arg(key)
+                            .ignore();
+                    }
+                }
+                pipe.query_async::<()>(conn).await?;
+            }
+
+            cursor = next;
+            if cursor == 0 {
+                break;
+            }
+        }
+
+        redis::cmd("SREM")
+            .arg(building_key(collection))
+            .arg(field)
+            .query_async::<()>(conn)
+            .await?;
+    }
+
+    redis::cmd("ZCARD").arg(&index).query_async(conn).await
+}
+
+/// Applies `(key, [field, score]...)` entries to every registered index of
+/// a collection: ZADD where the document has a score for the field, ZREM
+/// otherwise.
+const UPDATE_SCRIPT: &str = r#"
+local fields = redis.call('SMEMBERS', KEYS[1])
+if #fields == 0 then
+    return 0
+end
+
+local i = 2
+while i <= #ARGV do
+    local key, count = ARGV[i], tonumber(ARGV[i + 1])
+    local scores = {}
+    for j = i + 2, i + 1 + 2 * count, 2 do
+        scores[ARGV[j]] = ARGV[j + 1]
+    end
+    for _, field in ipairs(fields) do
+        if scores[field] then
+            redis.call('ZADD', ARGV[1] .. field, scores[field], key)
+        else
+            redis.call('ZREM', ARGV[1] .. field, key)
+        end
+    end
+    i = i + 2 + 2 * count
+end
+return #fields
+"#;
+
+/// Queue the index updates for written (`Some`) or deleted (`None`)
+/// documents, given as `(key, document)` pairs, onto a write pipeline.
+///
+/// The registry is read inside the script, so a collection without
+/// indexes costs no extra round trip.
+pub fn queue_update(
+    pipe: &mut redis::Pipeline,
+    collection: &str,
+    documents: &[(&str, Option<&Value>)],
+) {
+    if documents.is_empty() {
+        return;
+    }
+
+    let mut cmd = redis::cmd("EVAL");
+    cmd.arg(UPDATE_SCRIPT)
+        .arg(1)
+        .arg(registry_key(collection))
+        .arg(index_key(collection, ""));
+    for &(doc_key, doc) in documents {
+        let scores: Vec<(&String, f64)> = doc
+            .and_then(Value::as_object)
+            .map(|fields| {
+                fields
+                    .iter()
+                    .filter_map(|(field, value)| Some((field, value.as_f64()?)))
+                    .collect()
+            })
+            .unwrap_or_default();
+        cmd.arg(doc_key).arg(scores.len());
+        for (field, score) in scores {
+            cmd.arg(field).arg(score);
+        }
+    }
+    pipe.add_command(cmd).ignore();
+}
+
+/// Empties every index of a collection, keeping the indexes registered
+const CLEAR_SCRIPT: &str = r#"
+for _, field in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    redis.call('DEL', ARGV[1] .. field)
+end
+return 0
+"#;
+
+/// Queue emptying every index of a collection onto a write pipeline
+pub fn queue_clear(pipe: &mut redis::Pipeline, collection: &str) {
+    pipe.cmd("EVAL")
+        .arg(CLEAR_SCRIPT)
+        .arg(1)
+        .arg(registry_key(collection))
+        .arg(index_key(collection, ""))
+        .ignore();
+}
+
+/// Drop every index of a collection, so queries scan it instead of
+/// trusting an index that may have missed a write
+pub async fn invalidate(conn: &mut ConnectionManager, collection: &str) -> RedisResult<()> {
+    redis::cmd("DEL")
+        .arg(registry_key(collection))
+        .arg(building_key(collection))
+        .query_async(conn)
+        .await
+}
+
+/// ZRANGEBYSCORE bounds for a filter an index can answer
+fn score_range(filter: &Filter) -> Option<(String, String)> {
+    let value = || filter.value.as_f64();
+
+    match filter.operator.as_str() {
+        "eq" => {
+            let value = value()?;
+            Some((value.to_string(), value.to_string()))
+        }
+        "gt" => Some((format!("({}", value()?), "+inf".to_string())),
+        "gte" => Some((value()?.to_string(), "+inf".to_string())),
+        "lt" => Some(("-inf".to_string(), format!("({}", value()?))),
+        "lte" => Some(("-inf".to_string(), value()?.to_string())),
+        "between" => match &filter.value {
+            Value::Array(bounds) if bounds.len() == 2 => Some((
+                bounds[0].as_f64()?.to_string(),
+                bounds[1].as_f64()?.to_string(),
+            )),
+            _ => None,
+        },
+        _ => None,
+    }
+}
+
+/// Keys of the documents that can match the filters, read from an index.
+///
+/// Returns `None` when no filter can be answered by a complete index and
+/// the collection has to be scanned. The caller still applies every
+/// filter to the returned documents.
+pub async fn candidate_keys(
+    conn: &mut ConnectionManager,
+    collection: &str,
+    filters: &[Filter],
+) -> RedisResult<Option<Vec<String>>> {
+    if !filters.iter().any(|filter| score_range(filter).is_some()) {
+        return Ok(None);
+    }
+
+    let fields = ready_fields(conn, collection).await?;
+    for filter in filters {
+        if !fields.contains(&filter.field) {
+            continue;
+        }
+        if let Some((min, max)) = score_range(filter) {
+            let keys = redis::cmd("ZRANGEBYSCORE")
+                .arg(index_key(collection, &filter.field))
+                .arg(min)
+                .arg(max)
+                .query_async(conn)
+                .await?;
+            return Ok(Some(keys));
+        }
+    }
+
+    Ok(None)
+}
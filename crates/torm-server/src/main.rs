@@ -2,11 +2,14 @@
 //!
 //! Provides HTTP API for multi-language TORM support
 
+mod index;
+mod query;
 mod studio;
 
 use axum::{
-    extract::{Path, State},
-    http::StatusCode,
+    body::Body,
+    extract::{Path, Query, State},
+    http::{header, StatusCode},
     response::IntoResponse,
     routing::{get, post},
     Json, Router,
@@ -59,7 +62,11 @@ async fn main() -> anyhow::Result<()> {
         .route("/health", get(health))
         .route("/api/:collection", post(create_document))
         .route("/api/:collection", get(find_all_documents))
+        .route("/api/:collection", axum::routing::delete(delete_collection))
+        .route("/api/:collection/batch", post(create_documents_batch))
+        .route("/api/:collection/delete", post(delete_documents))
         .route("/api/:collection/:id", get(find_by_id))
+        .route("/api/:collection/:id", axum::routing::head(document_exists))
         .route("/api/:collection/:id", axum::routing::put(update_document))
         .route(
             "/api/:collection/:id",
@@ -67,6 +74,10 @@ async fn main() -> anyhow::Result<()> {
         )
         .route("/api/:collection/query", post(query_documents))
         .route("/api/:collection/count", get(count_documents))
+        .route("/api/:collection/count", post(count_matching_documents))
+        .route("/api/:collection/stream", get(stream_documents))
+        .route("/api/:collection/stream", post(stream_query))
+        .route("/api/:collection/index", post(create_index))
         .nest("/studio", studio::studio_router(studio_state))
         .layer(CorsLayer::permissive())
         .with_state(Arc::new(state));
@@ -94,12 +105,18 @@ async fn root() -> impl IntoResponse {
         "endpoints": {
             "health": "GET /health",
             "create": "POST /api/{collection}",
-            "find_all": "GET /api/{collection}",
+            "create_batch": "POST /api/{collection}/batch",
+            "find_all": "GET /api/{collection}?projection=field1,field2",
             "find_by_id": "GET /api/{collection}/{id}",
+            "exists": "HEAD /api/{collection}/{id}",
             "update": "PUT /api/{collection}/{id}",
             "delete": "DELETE /api/{collection}/{id}",
+            "delete_many": "POST /api/{collection}/delete",
+            "truncate": "DELETE /api/{collection}",
             "query": "POST /api/{collection}/query",
-            "count": "GET /api/{collection}/count"
+            "count": "GET /api/{collection}/count",
+            "stream": "GET /api/{collection}/stream (NDJSON)",
+            "index": "POST /api/{collection}/index"
         }
     }))
 }
@@ -157,13 +174,11 @@ async fn create_document(
     };
 
     let key = format!("{}:{}", collection, id);
+    let mut set = redis::cmd("SET");
+    set.arg(&key).arg(serde_json::to_string(&req.data).unwrap());
+    let written = [(key.as_str(), Some(&req.data))];
 
-    match redis::cmd("SET")
-        .arg(&key)
-        .arg(serde_json::to_string(&req.data).unwrap())
-        .query_async::<()>(&mut state.db.connection().clone())
-        .await
-    {
+    match write_with_indexes::<()>(&state, &collection, set, &written).await {
         Ok(_) => (
             StatusCode::CREATED,
             Json(CreateResponse {
@@ -187,51 +202,325 @@ async fn create_document(
     }
 }
 
+// Create several documents with a single MSET
+#[derive(Deserialize)]
+struct BatchCreateRequest {
+    data: Vec<serde_json::Value>,
+}
+
+async fn create_documents_batch(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Json(req): Json<BatchCreateRequest>,
+) -> impl IntoResponse {
+    info!(
+        "Creating {} documents in collection: {}",
+        req.data.len(),
+        collection
+    );
+
+    if req.data.is_empty() {
+        return (
+            StatusCode::CREATED,
+            Json(serde_json::json!({
+                "success": true,
+                "ids": [],
+                "data": []
+            })),
+        )
+            .into_response();
+    }
+
+    let mut ids = Vec::with_capacity(req.data.len());
+    let mut keys = Vec::with_capacity(req.data.len());
+    let mut cmd = redis::cmd("MSET");
+
+    for doc in &req.data {
+        // Extract or generate ID, same as single create
+        let id = if let Some(id_value) = doc.get("id") {
+            id_value.as_str().unwrap_or_default().to_string()
+        } else {
+            format!("{}:{}", collection, uuid::Uuid::new_v4())
+        };
+
+        let key = format!("{}:{}", collection, id);
+        cmd.arg(&key).arg(serde_json::to_string(doc).unwrap());
+        keys.push(key);
+        ids.push(id);
+    }
+
+    let written: Vec<_> = keys
+        .iter()
+        .zip(&req.data)
+        .map(|(key, doc)| (key.as_str(), Some(doc)))
+        .collect();
+
+    match write_with_indexes::<()>(&state, &collection, cmd, &written).await {
+        Ok(_) => (
+            StatusCode::CREATED,
+            Json(serde_json::json!({
+                "success": true,
+                "ids": ids,
+                "data": req.data
+            })),
+        )
+            .into_response(),
+        Err(e) => {
+            error!("Failed to create documents: {}", e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "success": false,
+                    "error": e.to_string()
+                })),
+            )
+                .into_response()
+        }
+    }
+}
+
+// Load documents for the given keys with a single MGET round-trip
+async fn fetch_documents(
+    state: &AppState,
+    keys: &[String],
+) -> redis::RedisResult<Vec<serde_json::Value>> {
+    if keys.is_empty() {
+        return Ok(Vec::new());
+    }
+
+    let values = redis::cmd("MGET")
+        .arg(keys)
+        .query_async::<Vec<Option<String>>>(&mut state.db.connection().clone())
+        .await?;
+    Ok(values
+        .into_iter()
+        .flatten()
+        .filter_map(|value| serde_json::from_str::<serde_json::Value>(&value).ok())
+        .collect())
+}
+
+// Run a write and the index updates for the written (Some) or deleted
+// (None) documents as one MULTI/EXEC round trip. If that fails the
+// collection's indexes are dropped, so queries scan it instead of
+// trusting an index that may have missed the write.
+async fn write_with_indexes<T: redis::FromRedisValue>(
+    state: &AppState,
+    collection: &str,
+    write: redis::Cmd,
+    documents: &[(&str, Option<&serde_json::Value>)],
+) -> redis::RedisResult<T> {
+    let mut conn = state.db.connection().clone();
+    let mut pipe = redis::pipe();
+    pipe.atomic().add_command(write);
+    index::queue_update(&mut pipe, collection, documents);
+
+    let result = pipe
+        .query_async::<(T,)>(&mut conn)
+        .await
+        .map(|(value,)| value);
+    if result.is_err() {
+        if let Err(e) = index::invalidate(&mut conn, collection).await {
+            error!("Failed to invalidate indexes for {}: {}", collection, e);
+        }
+    }
+    result
+}
+
 // Find all documents
+#[derive(Deserialize)]
+struct FindParams {
+    projection: Option<String>,
+}
+
 async fn find_all_documents(
     State(state): State<Arc<AppState>>,
     Path(collection): Path<String>,
+    Query(params): Query<FindParams>,
 ) -> impl IntoResponse {
     info!("Finding all documents in collection: {}", collection);
 
     let pattern = format!("{}:*", collection);
+    let keys = redis::cmd("KEYS")
+        .arg(&pattern)
+        .query_async::<Vec<String>>(&mut state.db.connection().clone())
+        .await;
 
-    match redis::cmd("KEYS")
+    match keys {
+        Ok(keys) => match fetch_documents(&state, &keys).await {
+            Ok(mut documents) => {
+                if let Some(fields) = query::parse_projection(params.projection.as_deref()) {
+                    documents = documents
+                        .into_iter()
+                        .map(|doc| query::project_document(doc, &fields))
+                        .collect();
+                }
+
+                (
+                    StatusCode::OK,
+                    Json(serde_json::json!({
+                        "collection": collection,
+                        "count": documents.len(),
+                        "documents": documents
+                    })),
+                )
+            }
+            Err(e) => find_error(e),
+        },
+        Err(e) => find_error(e),
+    }
+}
+
+fn find_error(e: redis::RedisError) -> (StatusCode, Json<serde_json::Value>) {
+    error!("Failed to find documents: {}", e);
+    (
+        StatusCode::INTERNAL_SERVER_ERROR,
+        Json(serde_json::json!({
+            "error": e.to_string(),
+            "documents": []
+        })),
+    )
+}
+
+// Stream documents as newline-delimited JSON
+async fn stream_documents(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Query(params): Query<FindParams>,
+) -> impl IntoResponse {
+    info!("Streaming documents in collection: {}", collection);
+
+    let pattern = format!("{}:*", collection);
+    let keys = match redis::cmd("KEYS")
         .arg(&pattern)
         .query_async::<Vec<String>>(&mut state.db.connection().clone())
         .await
     {
-        Ok(keys) => {
-            let mut documents = Vec::new();
-
-            for key in keys {
-                if let Ok(value) = redis::cmd("GET")
-                    .arg(&key)
-                    .query_async::<String>(&mut state.db.connection().clone())
-                    .await
-                {
-                    if let Ok(doc) = serde_json::from_str::<serde_json::Value>(&value) {
-                        documents.push(doc);
-                    }
+        Ok(keys) => keys,
+        Err(e) => {
+            error!("Failed to stream documents: {}", e);
+            return (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "error": e.to_string()
+                })),
+            )
+                .into_response();
+        }
+    };
+
+    let stream = DocumentStream {
+        state,
+        keys: keys.into_iter(),
+        filters: Vec::new(),
+        projection: query::parse_projection(params.projection.as_deref()),
+        skip: 0,
+        remaining: usize::MAX,
+    };
+    ndjson_response(stream.into_body())
+}
+
+/// Keys read per MGET while streaming; only one batch of documents is
+/// held in memory at a time
+const STREAM_BATCH_SIZE: usize = 500;
+
+/// Newline-delimited JSON documents read lazily from a list of keys
+struct DocumentStream {
+    state: Arc<AppState>,
+    keys: std::vec::IntoIter<String>,
+    filters: Vec<query::Filter>,
+    projection: Option<Vec<String>>,
+    skip: usize,
+    remaining: usize,
+}
+
+impl DocumentStream {
+    /// Response body sending one chunk of document lines per batch
+    fn into_body(self) -> Body {
+        Body::from_stream(futures_util::stream::unfold(
+            self,
+            |mut stream| async move { stream.next_chunk().await.map(|chunk| (chunk, stream)) },
+        ))
+    }
+
+    /// Lines of the next batch with any output, or None once the keys or
+    /// the limit are used up
+    async fn next_chunk(&mut self) -> Option<redis::RedisResult<String>> {
+        while self.remaining > 0 {
+            let batch: Vec<String> = self.keys.by_ref().take(STREAM_BATCH_SIZE).collect();
+            if batch.is_empty() {
+                return None;
+            }
+
+            let values = match redis::cmd("MGET")
+                .arg(&batch)
+                .query_async::<Vec<Option<String>>>(&mut self.state.db.connection().clone())
+                .await
+            {
+                Ok(values) => values,
+                Err(e) => {
+                    error!("Failed to stream documents: {}", e);
+                    return Some(Err(e));
+                }
+            };
+
+            let mut chunk = String::new();
+            for value in values.into_iter().flatten() {
+                let Some(line) = self.render(value) else {
+                    continue;
+                };
+                if self.skip > 0 {
+                    self.skip -= 1;
+                    continue;
                 }
+                chunk.push_str(&line);
+                chunk.push('\n');
+                self.remaining -= 1;
+                if self.remaining == 0 {
+                    break;
+                }
+            }
+            if !chunk.is_empty() {
+                return Some(Ok(chunk));
             }
+        }
+        None
+    }
 
-            Json(serde_json::json!({
-                "collection": collection,
-                "count": documents.len(),
-                "documents": documents
-            }))
+    /// A stored document as one JSON line, or None if it is invalid or
+    /// filtered out
+    fn render(&self, value: String) -> Option<String> {
+        // Values written through the API are compact JSON and pass through
+        // untouched; ones written around it (studio, redis-cli) may span
+        // several lines and are re-serialized to keep the NDJSON framing
+        let single_line = !value.contains(['\n', '\r']);
+        if single_line && self.filters.is_empty() && self.projection.is_none() {
+            return serde_json::from_str::<serde::de::IgnoredAny>(&value)
+                .is_ok()
+                .then_some(value);
         }
-        Err(e) => {
-            error!("Failed to find documents: {}", e);
-            Json(serde_json::json!({
-                "error": e.to_string(),
-                "documents": []
-            }))
+
+        let doc = serde_json::from_str::<serde_json::Value>(&value).ok()?;
+        if !query::matches_filters(&doc, &self.filters) {
+            return None;
         }
+        Some(match &self.projection {
+            Some(fields) => query::project_document(doc, fields).to_string(),
+            None if single_line => value,
+            None => doc.to_string(),
+        })
     }
 }
 
+/// 200 response with a newline-delimited JSON body
+fn ndjson_response(body: Body) -> axum::response::Response {
+    (
+        StatusCode::OK,
+        [(header::CONTENT_TYPE, "application/x-ndjson")],
+        body,
+    )
+        .into_response()
+}
+
 // Find by ID
 async fn find_by_id(
     State(state): State<Arc<AppState>>,
@@ -270,6 +559,27 @@ async fn find_by_id(
     }
 }
 
+// Check whether a document exists without sending it
+async fn document_exists(
+    State(state): State<Arc<AppState>>,
+    Path((collection, id)): Path<(String, String)>,
+) -> StatusCode {
+    let key = format!("{}:{}", collection, id);
+
+    match redis::cmd("EXISTS")
+        .arg(&key)
+        .query_async::<i32>(&mut state.db.connection().clone())
+        .await
+    {
+        Ok(1) => StatusCode::OK,
+        Ok(_) => StatusCode::NOT_FOUND,
+        Err(e) => {
+            error!("Failed to check document {}: {}", key, e);
+            StatusCode::INTERNAL_SERVER_ERROR
+        }
+    }
+}
+
 // Update document
 #[derive(Deserialize)]
 struct UpdateRequest {
@@ -293,31 +603,42 @@ async fn update_document(
     {
         Ok(1) => {
             // Document exists, update it
-            match redis::cmd("SET")
-                .arg(&key)
-                .arg(serde_json::to_string(&req.data).unwrap())
-                .query_async::<()>(&mut state.db.connection().clone())
-                .await
-            {
-                Ok(_) => Json(serde_json::json!({
-                    "success": true,
-                    "id": id,
-                    "data": req.data
-                })),
-                Err(e) => Json(serde_json::json!({
-                    "success": false,
-                    "error": e.to_string()
-                })),
+            let mut set = redis::cmd("SET");
+            set.arg(&key).arg(serde_json::to_string(&req.data).unwrap());
+            let written = [(key.as_str(), Some(&req.data))];
+
+            match write_with_indexes::<()>(&state, &collection, set, &written).await {
+                Ok(_) => (
+                    StatusCode::OK,
+                    Json(serde_json::json!({
+                        "success": true,
+                        "id": id,
+                        "data": req.data
+                    })),
+                ),
+                Err(e) => (
+                    StatusCode::INTERNAL_SERVER_ERROR,
+                    Json(serde_json::json!({
+                        "success": false,
+                        "error": e.to_string()
+                    })),
+                ),
             }
         }
-        Ok(_) => Json(serde_json::json!({
-            "success": false,
-            "error": "Document not found"
-        })),
-        Err(e) => Json(serde_json::json!({
-            "success": false,
-            "error": e.to_string()
-        })),
+        Ok(_) => (
+            StatusCode::NOT_FOUND,
+            Json(serde_json::json!({
+                "success": false,
+                "error": "Document not found"
+            })),
+        ),
+        Err(e) => (
+            StatusCode::INTERNAL_SERVER_ERROR,
+            Json(serde_json::json!({
+                "success": false,
+                "error": e.to_string()
+            })),
+        ),
     }
 }
 
@@ -330,11 +651,10 @@ async fn delete_document(
 
     let key = format!("{}:{}", collection, id);
 
-    match redis::cmd("DEL")
-        .arg(&key)
-        .query_async::<i32>(&mut state.db.connection().clone())
-        .await
-    {
+    let mut del = redis::cmd("DEL");
+    del.arg(&key);
+
+    match write_with_indexes::<i32>(&state, &collection, del, &[(key.as_str(), None)]).await {
         Ok(1) => Json(serde_json::json!({
             "success": true,
             "deleted": true
@@ -350,63 +670,371 @@ async fn delete_document(
     }
 }
 
+// Delete several documents by ID with a single DEL
+#[derive(Deserialize)]
+struct DeleteManyRequest {
+    ids: Vec<String>,
+}
+
+async fn delete_documents(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Json(req): Json<DeleteManyRequest>,
+) -> impl IntoResponse {
+    info!(
+        "Deleting {} documents in collection: {}",
+        req.ids.len(),
+        collection
+    );
+
+    if req.ids.is_empty() {
+        return (
+            StatusCode::OK,
+            Json(serde_json::json!({
+                "success": true,
+                "deleted": 0
+            })),
+        );
+    }
+
+    let keys: Vec<String> = req
+        .ids
+        .iter()
+        .map(|id| format!("{}:{}", collection, id))
+        .collect();
+
+    let mut del = redis::cmd("DEL");
+    del.arg(&keys);
+    let removed: Vec<(&str, Option<&serde_json::Value>)> =
+        keys.iter().map(|key| (key.as_str(), None)).collect();
+
+    match write_with_indexes::<usize>(&state, &collection, del, &removed).await {
+        Ok(deleted) => (
+            StatusCode::OK,
+            Json(serde_json::json!({
+                "success": true,
+                "deleted": deleted
+            })),
+        ),
+        Err(e) => {
+            error!("Failed to delete documents: {}", e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "success": false,
+                    "error": e.to_string()
+                })),
+            )
+        }
+    }
+}
+
+// Delete every document in a collection
+async fn delete_collection(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+) -> impl IntoResponse {
+    info!("Deleting all documents in collection: {}", collection);
+
+    let pattern = format!("{}:*", collection);
+    let mut conn = state.db.connection().clone();
+
+    let keys = match redis::cmd("KEYS")
+        .arg(&pattern)
+        .query_async::<Vec<String>>(&mut conn)
+        .await
+    {
+        Ok(keys) => keys,
+        Err(e) => {
+            error!("Failed to delete collection {}: {}", collection, e);
+            return (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "success": false,
+                    "error": e.to_string()
+                })),
+            );
+        }
+    };
+
+    // Empty the indexes in the same transaction, so no write lands between
+    let mut pipe = redis::pipe();
+    pipe.atomic();
+    if !keys.is_empty() {
+        pipe.cmd("DEL").arg(&keys);
+    }
+    index::queue_clear(&mut pipe, &collection);
+
+    // Only the DEL count is returned, and only if there was anything to delete
+    match pipe.query_async::<Vec<usize>>(&mut conn).await {
+        Ok(deleted) => (
+            StatusCode::OK,
+            Json(serde_json::json!({
+                "success": true,
+                "deleted": deleted.first().copied().unwrap_or(0)
+            })),
+        ),
+        Err(e) => {
+            error!("Failed to delete collection {}: {}", collection, e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "success": false,
+                    "error": e.to_string()
+                })),
+            )
+        }
+    }
+}
+
 // Query documents
 #[derive(Deserialize)]
 struct QueryRequest {
-    #[allow(dead_code)]
     filters: Option<serde_json::Value>,
-    #[allow(dead_code)]
-    sort: Option<serde_json::Value>,
+    sort: Option<query::Sort>,
     limit: Option<usize>,
     skip: Option<usize>,
+    projection: Option<Vec<String>>,
+}
+
+/// Keys of the documents that may match the filters
+async fn candidate_keys(
+    state: &AppState,
+    collection: &str,
+    filters: &[query::Filter],
+) -> redis::RedisResult<Vec<String>> {
+    let pattern = format!("{}:*", collection);
+    let mut conn = state.db.connection().clone();
+
+    // Narrow the candidates with an index when a filter allows it,
+    // otherwise scan the whole collection
+    match index::candidate_keys(&mut conn, collection, filters).await {
+        Ok(Some(keys)) => Ok(keys),
+        Ok(None) => {
+            redis::cmd("KEYS")
+                .arg(&pattern)
+                .query_async::<Vec<String>>(&mut conn)
+                .await
+        }
+        Err(e) => {
+            error!("Failed to read indexes for {}: {}", collection, e);
+            redis::cmd("KEYS")
+                .arg(&pattern)
+                .query_async::<Vec<String>>(&mut conn)
+                .await
+        }
+    }
+}
+
+/// Documents of a collection matching every filter, in storage order
+async fn matching_documents(
+    state: &AppState,
+    collection: &str,
+    filters: &[query::Filter],
+) -> redis::RedisResult<Vec<serde_json::Value>> {
+    let keys = candidate_keys(state, collection, filters).await?;
+
+    Ok(fetch_documents(state, &keys)
+        .await?
+        .into_iter()
+        .filter(|doc| query::matches_filters(doc, filters))
+        .collect())
+}
+
+/// Run a query, returning the number of matches before skip/limit and
+/// the requested page of documents
+async fn run_query(
+    state: &AppState,
+    collection: &str,
+    request: QueryRequest,
+) -> redis::RedisResult<(usize, Vec<serde_json::Value>)> {
+    let filters = query::parse_filters(request.filters);
+    let mut documents = matching_documents(state, collection, &filters).await?;
+    let total = documents.len();
+
+    if let Some(sort) = &request.sort {
+        query::sort_documents(&mut documents, sort);
+    }
+
+    // Apply skip/limit
+    let skip = request.skip.unwrap_or(0);
+    let limit = request.limit.unwrap_or(documents.len());
+    let documents = documents
+        .into_iter()
+        .skip(skip)
+        .take(limit)
+        .map(|doc| match &request.projection {
+            Some(fields) => query::project_document(doc, fields),
+            None => doc,
+        })
+        .collect();
+
+    Ok((total, documents))
 }
 
 async fn query_documents(
     State(state): State<Arc<AppState>>,
     Path(collection): Path<String>,
-    Json(query): Json<QueryRequest>,
+    Json(request): Json<QueryRequest>,
 ) -> impl IntoResponse {
     info!("Querying documents in collection: {}", collection);
 
-    // For now, just return all and let client filter
-    // TODO: Implement server-side filtering
-    let pattern = format!("{}:*", collection);
+    match run_query(&state, &collection, request).await {
+        Ok((total, documents)) => (
+            StatusCode::OK,
+            Json(serde_json::json!({
+                "collection": collection,
+                "count": documents.len(),
+                "total": total,
+                "documents": documents
+            })),
+        ),
+        Err(e) => {
+            error!("Failed to query documents: {}", e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "error": e.to_string(),
+                    "documents": []
+                })),
+            )
+        }
+    }
+}
 
-    match redis::cmd("KEYS")
-        .arg(&pattern)
-        .query_async::<Vec<String>>(&mut state.db.connection().clone())
-        .await
-    {
-        Ok(keys) => {
-            let mut documents = Vec::new();
-
-            for key in keys {
-                if let Ok(value) = redis::cmd("GET")
-                    .arg(&key)
-                    .query_async::<String>(&mut state.db.connection().clone())
-                    .await
-                {
-                    if let Ok(doc) = serde_json::from_str::<serde_json::Value>(&value) {
-                        documents.push(doc);
-                    }
-                }
+// Stream query results as newline-delimited JSON
+async fn stream_query(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Json(request): Json<QueryRequest>,
+) -> impl IntoResponse {
+    info!("Streaming query results in collection: {}", collection);
+
+    if request.sort.is_some() {
+        // Sorting needs every match first; the lines are still sent one
+        // document at a time instead of as one string
+        return match run_query(&state, &collection, request).await {
+            Ok((_, documents)) => ndjson_response(Body::from_stream(futures_util::stream::iter(
+                documents
+                    .into_iter()
+                    .map(|doc| Ok::<_, std::convert::Infallible>(format!("{}\n", doc))),
+            ))),
+            Err(e) => {
+                error!("Failed to stream query results: {}", e);
+                (
+                    StatusCode::INTERNAL_SERVER_ERROR,
+                    Json(serde_json::json!({
+                        "error": e.to_string()
+                    })),
+                )
+                    .into_response()
             }
+        };
+    }
+
+    let filters = query::parse_filters(request.filters);
+    match candidate_keys(&state, &collection, &filters).await {
+        Ok(keys) => {
+            let stream = DocumentStream {
+                state,
+                keys: keys.into_iter(),
+                filters,
+                projection: request.projection,
+                skip: request.skip.unwrap_or(0),
+                remaining: request.limit.unwrap_or(usize::MAX),
+            };
+            ndjson_response(stream.into_body())
+        }
+        Err(e) => {
+            error!("Failed to stream query results: {}", e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "error": e.to_string()
+                })),
+            )
+                .into_response()
+        }
+    }
+}
+
+#[derive(Deserialize)]
+struct CountRequest {
+    filters: Option<serde_json::Value>,
+}
+
+// Count the documents matching a set of filters
+async fn count_matching_documents(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Json(request): Json<CountRequest>,
+) -> impl IntoResponse {
+    info!("Counting matching documents in collection: {}", collection);
 
-            // Apply skip/limit
-            let skip = query.skip.unwrap_or(0);
-            let limit = query.limit.unwrap_or(documents.len());
-            let documents: Vec<_> = documents.into_iter().skip(skip).take(limit).collect();
+    let filters = query::parse_filters(request.filters);
 
+    match matching_documents(&state, &collection, &filters).await {
+        Ok(documents) => (
+            StatusCode::OK,
             Json(serde_json::json!({
                 "collection": collection,
-                "count": documents.len(),
-                "documents": documents
-            }))
+                "count": documents.len()
+            })),
+        ),
+        Err(e) => {
+            error!("Failed to count documents: {}", e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "error": e.to_string(),
+                    "count": 0
+                })),
+            )
+        }
+    }
+}
+
+// Create a secondary index on a numeric field (a no-op if it already exists)
+#[derive(Deserialize)]
+struct IndexRequest {
+    field: String,
+}
+
+async fn create_index(
+    State(state): State<Arc<AppState>>,
+    Path(collection): Path<String>,
+    Json(req): Json<IndexRequest>,
+) -> impl IntoResponse {
+    info!("Indexing field {} in collection: {}", req.field, collection);
+
+    // Run the backfill as its own task, so it finishes even if the client
+    // gives up waiting. Queries use the index once the backfill is done
+    let mut conn = state.db.connection().clone();
+    let (task_collection, field) = (collection.clone(), req.field.clone());
+    let built =
+        tokio::spawn(async move { index::build_index(&mut conn, &task_collection, &field).await })
+            .await
+            .unwrap_or_else(|e| Err(redis::RedisError::from(std::io::Error::other(e))));
+
+    match built {
+        Ok(indexed) => (
+            StatusCode::OK,
+            Json(serde_json::json!({
+                "success": true,
+                "field": req.field,
+                "indexed": indexed
+            })),
+        ),
+        Err(e) => {
+            error!("Failed to build index {}.{}: {}", collection, req.field, e);
+            (
+                StatusCode::INTERNAL_SERVER_ERROR,
+                Json(serde_json::json!({
+                    "success": false,
+                    "error": e.to_string()
+                })),
+            )
         }
-        Err(e) => Json(serde_json::json!({
-            "error": e.to_string(),
-            "documents": []
-        })),
     }
 }
 
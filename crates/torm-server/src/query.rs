@@ -0,0 +1,185 @@
+//! Server-side query evaluation
+//!
+//! Applies filters, sorting and projection to documents so clients only
+//! receive the rows and fields they asked for.
+
+use serde::Deserialize;
+use serde_json::{Map, Value};
+use std::cmp::Ordering;
+
+/// A single `{field, operator, value}` filter as sent by the SDKs
+#[derive(Debug, Deserialize)]
+pub struct Filter {
+    pub field: String,
+    pub operator: String,
+    pub value: Value,
+}
+
+/// Sort specification: `{field, order}`
+#[derive(Debug, Deserialize)]
+pub struct Sort {
+    pub field: String,
+    #[serde(default)]
+    pub order: Option<String>,
+}
+
+/// Parse the `filters` payload of a query request.
+///
+/// Accepts either a list of `{field, operator, value}` objects or a plain
+/// `{field: value}` object, which is treated as a set of equality filters.
+pub fn parse_filters(filters: Option<Value>) -> Vec<Filter> {
+    match filters {
+        Some(Value::Array(items)) => items
+            .into_iter()
+            .filter_map(|item| serde_json::from_value(item).ok())
+            .collect(),
+        Some(Value::Object(map)) => map
+            .into_iter()
+            .map(|(field, value)| Filter {
+                field,
+                operator: "eq".to_string(),
+                value,
+            })
+            .collect(),
+        _ => Vec::new(),
+    }
+}
+
+/// Check whether a document matches all filters
+pub fn matches_filters(doc: &Value, filters: &[Filter]) -> bool {
+    filters.iter().all(|filter| matches_filter(doc, filter))
+}
+
+fn matches_filter(doc: &Value, filter: &Filter) -> bool {
+    let value = doc.get(&filter.field).unwrap_or(&Value::Null);
+
+    match filter.operator.as_str() {
+        "eq" => values_equal(value, &filter.value),
+        "ne" => !values_equal(value, &filter.value),
+        "gt" => compare_values(value, &filter.value) == Some(Ordering::Greater),
+        "gte" => matches!(
+            compare_values(value, &filter.value),
+            Some(Ordering::Greater | Ordering::Equal)
+        ),
+        "lt" => compare_values(value, &filter.value) == Some(Ordering::Less),
+        "lte" => matches!(
+            compare_values(value, &filter.value),
+            Some(Ordering::Less | Ordering::Equal)
+        ),
+        "between" => match &filter.value {
+            Value::Array(bounds) if bounds.len() == 2 => {
+                matches!(
+                    compare_values(value, &bounds[0]),
+                    Some(Ordering::Greater | Ordering::Equal)
+                ) && matches!(
+                    compare_values(value, &bounds[1]),
+                    Some(Ordering::Less | Ordering::Equal)
+                )
+            }
+            _ => false,
+        },
+        "contains" => {
+            let needle = match &filter.value {
+                Value::String(s) => s.clone(),
+                other => other.to_string(),
+            };
+            match value {
+                Value::String(s) => s.contains(&needle),
+                other => other.to_string().contains(&needle),
+            }
+        }
+        "in" => match &filter.value {
+            Value::Array(items) => items.iter().any(|item| values_equal(value, item)),
+            _ => false,
+        },
+        "not_in" => match &filter.value {
+            Value::Array(items) => !items.iter().any(|item| values_equal(value, item)),
+            _ => false,
+        },
+        _ => false,
+    }
+}
+
+fn values_equal(a: &Value, b: &Value) -> bool {
+    match compare_values(a, b) {
+        Some(ordering) => ordering == Ordering::Equal,
+        None => a == b,
+    }
+}
+
+fn compare_values(a: &Value, b: &Value) -> Option<Ordering> {
+    match (a, b) {
+        (Value::Number(x), Value::Number(y)) => x.as_f64()?.partial_cmp(&y.as_f64()?),
+        (Value::String(x), Value::String(y)) => Some(x.cmp(y)),
+        (Value::Bool(x), Value::Bool(y)) => Some(x.cmp(y)),
+        _ => None,
+    }
+}
+
+/// Position of a JSON type in the sort order: null/missing < bool < number < string < other
+fn type_rank(value: &Value) -> u8 {
+    match value {
+        Value::Null => 0,
+        Value::Bool(_) => 1,
+        Value::Number(_) => 2,
+        Value::String(_) => 3,
+        Value::Array(_) | Value::Object(_) => 4,
+    }
+}
+
+/// Total order over field values for sorting: by type first, then by value
+fn sort_order(a: &Value, b: &Value) -> Ordering {
+    type_rank(a).cmp(&type_rank(b)).then_with(|| match (a, b) {
+        (Value::Number(x), Value::Number(y)) => x
+            .as_f64()
+            .unwrap_or(f64::NAN)
+            .total_cmp(&y.as_f64().unwrap_or(f64::NAN)),
+        (Value::String(x), Value::String(y)) => x.cmp(y),
+        (Value::Bool(x), Value::Bool(y)) => x.cmp(y),
+        _ => Ordering::Equal,
+    })
+}
+
+/// Sort documents in place by the given field
+pub fn sort_documents(documents: &mut [Value], sort: &Sort) {
+    let descending = sort.order.as_deref() == Some("desc");
+
+    documents.sort_by(|a, b| {
+        let a = a.get(&sort.field).unwrap_or(&Value::Null);
+        let b = b.get(&sort.field).unwrap_or(&Value::Null);
+        let ordering = sort_order(a, b);
+        if descending {
+            ordering.reverse()
+        } else {
+            ordering
+        }
+    });
+}
+
+/// Keep only the requested fields (plus `id`) of a document
+pub fn project_document(doc: Value, fields: &[String]) -> Value {
+    match doc {
+        Value::Object(map) => Value::Object(
+            map.into_iter()
+                .filter(|(key, _)| key == "id" || fields.iter().any(|field| field == key))
+                .collect::<Map<String, Value>>(),
+        ),
+        other => other,
+    }
+}
+
+/// Parse a comma-separated `?projection=a,b` query string value
+pub fn parse_projection(projection: Option<&str>) -> Option<Vec<String>> {
+    let fields: Vec<String> = projection?
+        .split(',')
+        .map(str::trim)
+        .filter(|field| !field.is_empty())
+        .map(str::to_string)
+        .collect();
+
+    if fields.is_empty() {
+        None
+    } else {
+        Some(fields)
+    }
+}
@@ -1,12 +1,14 @@
 """Example: Basic CRUD operations with TORM Python SDK"""
 
-import asyncio
-from toonstore import TormClient, Model
+from toonstore import run, TormClient, Model
 
 
 class User(Model):
     """User model"""
     
+    # Slots keep instances small when find() returns many users
+    __slots__ = ('id', 'name', 'email', 'age')
+    
     def __init__(self, id=None, name=None, email=None, age=None):
         self.id = id
         self.name = name
@@ -25,13 +27,14 @@ async def main():
         
         # Create a user
         print("Creating user...")
-        user = User(
-            id="user:1",
-            name="John Doe",
-            email="john@example.com",
-            age=30
-        )
-        await user.save()
+        # save() on a model with an id updates an existing document, so
+        # documents with a chosen id are created with create()
+        user = await User.create({
+            "id": "user:1",
+            "name": "John Doe",
+            "email": "john@example.com",
+            "age": 30
+        })
         print(f"✅ Created: {user}\n")
         
         # Find by ID
@@ -47,10 +50,10 @@ async def main():
         
         # Create more users
         print("Creating more users...")
-        user2 = User(id="user:2", name="Jane Smith", email="jane@example.com", age=28)
-        user3 = User(id="user:3", name="Bob Wilson", email="bob@example.com", age=35)
-        await user2.save()
-        await user3.save()
+        await User.create_many([
+            {"id": "user:2", "name": "Jane Smith", "email": "jane@example.com", "age": 28},
+            {"id": "user:3", "name": "Bob Wilson", "email": "bob@example.com", "age": 35}
+        ])
         print("✅ Created 2 more users\n")
         
         # Find all users
@@ -61,9 +64,8 @@ async def main():
             print(f"   - {u.name} ({u.email})")
         print()
         
-        # Count users
-        count = await User.count()
-        print(f"✅ Total users: {count}\n")
+        # Count users (returned with the find() response)
+        print(f"✅ Total users: {users.total}\n")
         
         # Delete user
         print("Deleting user...")
@@ -71,9 +73,9 @@ async def main():
         print("✅ Deleted user:1\n")
         
         # Verify deletion
-        deleted = await User.find_by_id("user:1")
-        print(f"✅ User deleted: {deleted is None}\n")
+        deleted = not await User.exists("user:1")
+        print(f"✅ User deleted: {deleted}\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
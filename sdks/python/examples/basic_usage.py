@@ -34,43 +34,43 @@ def main():
     # 3. Create users
     print("Creating users...")
     try:
-        alice = User.create({
-            'id': 'user:alice',
-            'name': 'Alice Smith',
-            'email': 'alice@example.com',
-            'age': 30,
-            'active': True
-        })
-        print(f"✅ Created: {alice.get('name')}")
-        
-        bob = User.create({
-            'id': 'user:bob',
-            'name': 'Bob Johnson',
-            'email': 'bob@example.com',
-            'age': 25,
-            'active': True
-        })
-        print(f"✅ Created: {bob.get('name')}")
-        
-        charlie = User.create({
-            'id': 'user:charlie',
-            'name': 'Charlie Brown',
-            'email': 'charlie@example.com',
-            'age': 35,
-            'active': False
-        })
-        print(f"✅ Created: {charlie.get('name')}\n")
+        users = User.create_many([
+            {
+                'id': 'user:alice',
+                'name': 'Alice Smith',
+                'email': 'alice@example.com',
+                'age': 30,
+                'active': True
+            },
+            {
+                'id': 'user:bob',
+                'name': 'Bob Johnson',
+                'email': 'bob@example.com',
+                'age': 25,
+                'active': True
+            },
+            {
+                'id': 'user:charlie',
+                'name': 'Charlie Brown',
+                'email': 'charlie@example.com',
+                'age': 35,
+                'active': False
+            }
+        ])
+        for user in users:
+            print(f"✅ Created: {user.get('name')}")
+        print()
     except Exception as e:
-        print(f"❌ Failed to create user: {e}\n")
+        print(f"❌ Failed to create users: {e}\n")
     
     # 4. Find all users
     print("Finding all users...")
     try:
-        all_users = User.find()
-        print(f"✅ Found {len(all_users)} users")
-        for user in all_users:
+        found = 0
+        for user in User.iter(projection=['name', 'email']):
             print(f"   - {user.get('name')} ({user.get('email')})")
-        print()
+            found += 1
+        print(f"✅ Found {found} users\n")
     except Exception as e:
         print(f"❌ Failed to find users: {e}\n")
     
@@ -145,8 +145,7 @@ def main():
     # 11. Verify deletion
     print("Verifying deletion...")
     try:
-        user = User.find_by_id('user:charlie')
-        if user is None:
+        if not User.exists('user:charlie'):
             print("✅ User successfully deleted\n")
         else:
             print("❌ User still exists\n")
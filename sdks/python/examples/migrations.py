@@ -1,7 +1,6 @@
 """Example: Database migrations with TORM Python SDK"""
 
-import asyncio
-from toonstore import TormClient, MigrationManager
+from toonstore import run, TormClient, MigrationManager
 
 
 async def main():
@@ -25,19 +24,22 @@ async def main():
         async def create_products_down(client):
             print("  Rollback: Remove products collection...")
         
-        # Register migrations
+        # Register migrations; these two are independent, so parallel=True
+        # lets migrate() run them concurrently
         manager.add_migration(
             "001",
             "create_users",
             create_users_up,
-            create_users_down
+            create_users_down,
+            parallel=True
         )
         
         manager.add_migration(
             "002",
             "create_products",
             create_products_up,
-            create_products_down
+            create_products_down,
+            parallel=True
         )
         
         # Check status before
@@ -78,4 +80,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -13,6 +13,15 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/toonstore/torm",
     packages=find_packages(),
+    # Native validation loop; optional, so installs without a compiler
+    # fall back to the pure-Python validator
+    ext_modules=[
+        Extension(
+            "toonstore_torm._speedups",
+            ["toonstore_torm/_speedups.c"],
+            optional=True,
+        ),
+    ],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -27,8 +36,14 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "requests>=2.31.0",
+        "httpx[http2]>=0.27.0",
+        "orjson>=3.9.0",
     ],
+    extras_require={
+        "re2": ["google-re2>=1.1"],
+        "msgspec": ["msgspec>=0.18"],
+        "uvloop": ["uvloop>=0.19; platform_system != 'Windows'"],
+    },
     keywords="toonstore orm database redis toon",
     project_urls={
         "Bug Reports": "https://github.com/toonstore/torm/issues",
@@ -0,0 +1,312 @@
+"""
+Async SDK Tests
+
+Tests for the toonstore package against an in-process mock server
+"""
+
+import asyncio
+import httpx
+import orjson
+import pytest
+from toonstore import TormClient, Model, MigrationManager
+
+
+class MockServer:
+    """
+    In-process stand-in for torm-server, served through httpx.MockTransport
+
+    Documents and plain keys share one dict of raw strings, as they share
+    one Redis, and only the routes and response shapes of the real server
+    are answered.
+    """
+
+    def __init__(self):
+        self.redis = {}
+        self.requests = []
+        self.fail_writes = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def put_document(self, collection, doc):
+        self.redis[f"{collection}:{doc['id']}"] = orjson.dumps(doc).decode()
+
+    def migration_records(self):
+        return orjson.loads(orjson.loads(self.redis['torm:migrations']))
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content) if request.content else None
+        self.requests.append((request.method, request.url.path, body))
+        parts = request.url.path.strip('/').split('/')
+
+        # /studio/api/keys/:key
+        if parts[:3] == ['studio', 'api', 'keys'] and len(parts) == 4:
+            return self.handle_key(request.method, parts[3], body)
+        if parts[0] != 'api' or len(parts) not in (2, 3):
+            return httpx.Response(404)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Longer IDs answer sooner, so responses arrive out of order
+            await asyncio.sleep(0.01 / (1 + len(parts[-1])))
+            return self.handle_document(request.method, parts[1:], body)
+        finally:
+            self.in_flight -= 1
+
+    def handle_key(self, method, key, body):
+        if method == 'GET':
+            if key not in self.redis:
+                return httpx.Response(404, text='Response was of incompatible type: nil')
+            raw = self.redis[key]
+            try:
+                value = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                value = raw
+            return httpx.Response(200, json={'key': key, 'value': value, 'raw': raw})
+
+        if method != 'PUT':
+            return httpx.Response(405)
+        if 'value' not in (body or {}):
+            return httpx.Response(422, text='missing field `value`')
+        if self.fail_writes:
+            return httpx.Response(500, text='write failed')
+        self.redis[key] = orjson.dumps(body['value']).decode()
+        return httpx.Response(200, json={'success': True, 'key': key})
+
+    def handle_document(self, method, parts, body):
+        collection = parts[0]
+        if len(parts) == 1:
+            if method != 'POST':
+                return httpx.Response(405)
+            if 'data' not in (body or {}):
+                return httpx.Response(422, text='missing field `data`')
+            if self.fail_writes:
+                return httpx.Response(500, json={'success': False, 'error': 'write failed'})
+            data = body['data']
+            doc_id = data.get('id') or f'{collection}:{len(self.redis) + 1}'
+            self.redis[f'{collection}:{doc_id}'] = orjson.dumps(data).decode()
+            return httpx.Response(201, json={'success': True, 'id': doc_id, 'data': data})
+
+        key = f'{collection}:{parts[1]}'
+        if method == 'GET':
+            if key not in self.redis:
+                return httpx.Response(404, json={'error': 'Document not found'})
+            return httpx.Response(200, content=self.redis[key])
+        if method == 'PUT':
+            if 'data' not in (body or {}):
+                return httpx.Response(422, text='missing field `data`')
+            if key not in self.redis:
+                return httpx.Response(404, json={'success': False, 'error': 'Document not found'})
+            self.redis[key] = orjson.dumps(body['data']).decode()
+            return httpx.Response(200, json={'success': True, 'id': parts[1], 'data': body['data']})
+        return httpx.Response(405)
+
+
+@pytest.fixture
+def server():
+    return MockServer()
+
+
+@pytest.fixture
+async def client(server):
+    torm = TormClient(max_concurrency=3)
+    await torm.client.aclose()
+    torm.client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    async with torm:
+        yield torm
+
+
+@pytest.fixture
+def user_model(client):
+    class User(Model):
+        pass
+
+    User.set_client(client)
+    User.set_collection('user')
+    return User
+
+
+class TestModel:
+    """Test async model operations"""
+
+    async def test_find_many_keeps_order(self, server, user_model):
+        """Test find_many returns documents in the order given and skips missing ones"""
+        for doc_id in ['a', 'bb', 'ccc', 'dddd']:
+            server.put_document('user', {'id': doc_id, 'name': doc_id.upper()})
+
+        users = await user_model.find_many(['a', 'missing', 'ccc', 'dddd', 'bb'])
+        assert [user.id for user in users] == ['a', 'ccc', 'dddd', 'bb']
+
+    async def test_find_many_limits_concurrency(self, server, user_model):
+        """Test find_many keeps at most max_concurrency requests in flight"""
+        for i in range(12):
+            server.put_document('user', {'id': f'user{i}', 'name': 'Alice'})
+
+        users = await user_model.find_many([f'user{i}' for i in range(12)])
+        assert len(users) == 12
+        assert 1 < server.max_in_flight <= 3
+
+    async def test_save_assigns_id(self, server, user_model):
+        """Test saving a new document stores the server-assigned id"""
+        user = await user_model(name='Alice').save()
+        assert server.requests[-1] == ('POST', '/api/user', {'data': {'name': 'Alice'}})
+        assert orjson.loads(server.redis[f'user:{user.id}']) == {'name': 'Alice'}
+
+    async def test_save_checks_status_before_parsing(self, server, user_model):
+        """Test an error response raises HTTPStatusError, not a JSON decode error"""
+        server.fail_writes = True
+        with pytest.raises(httpx.HTTPStatusError):
+            await user_model(name='Alice').save()
+
+
+class TestSlottedModel:
+    """Test models declaring __slots__"""
+
+    def test_to_dict(self):
+        """Test to_dict reads slot values and skips unset and private slots"""
+        class Account(Model):
+            __slots__ = ('id', 'name', 'balance', '_loaded')
+
+        account = Account(name='Alice', balance=10)
+        account._loaded = True
+        assert not hasattr(account, '__dict__')
+        assert Account._fields == ('id', 'name', 'balance')
+        assert account.to_dict() == {'name': 'Alice', 'balance': 10}
+
+    def test_subclass_inherits_fields(self):
+        """Test slots declared on a base model are part of a subclass's fields"""
+        class Account(Model):
+            __slots__ = ('id', 'name')
+
+        class Admin(Account):
+            __slots__ = ('role',)
+
+        assert Admin._fields == ('id', 'name', 'role')
+        assert Admin(id='a1', role='owner').to_dict() == {'id': 'a1', 'role': 'owner'}
+
+    async def test_load_drops_undeclared_fields(self, server, client):
+        """Test loading a document keeps only the fields a slotted model declares"""
+        class Account(Model):
+            __slots__ = ('id', 'name')
+
+        Account.set_client(client)
+        Account.set_collection('account')
+        server.put_document('account', {'id': 'a1', 'name': 'Alice', 'plan': 'pro'})
+
+        account = await Account.find_by_id('a1')
+        assert account.to_dict() == {'id': 'a1', 'name': 'Alice'}
+        assert [a.to_dict() for a in await Account.find_many(['a1'])] == [
+            {'id': 'a1', 'name': 'Alice'}
+        ]
+
+
+class TestMigrations:
+    """Test the migration manager"""
+
+    @staticmethod
+    def recorder(log, name, fail=False):
+        async def step(client):
+            log.append(f'{name}:start')
+            await asyncio.sleep(0.01)
+            if fail:
+                raise RuntimeError(f'{name} failed')
+            log.append(f'{name}:end')
+        return step
+
+    def add(self, manager, log, id, parallel=False, fail=False):
+        manager.add_migration(
+            id, id, self.recorder(log, id, fail), self.recorder(log, f'{id}-down'),
+            parallel=parallel
+        )
+
+    async def test_migrate_and_rollback_write_once(self, server, client):
+        """Test migrate and rollback each record their changes in one write"""
+        manager = MigrationManager(client)
+        log = []
+        for id in ['001', '002', '003']:
+            self.add(manager, log, id)
+
+        assert await manager.migrate() == ['001', '002', '003']
+        assert await manager.migrate() == []
+        puts = [r for r in server.requests if r[0] == 'PUT']
+        assert len(puts) == 1
+        method, path, body = puts[0]
+        assert path == '/studio/api/keys/torm:migrations'
+        assert set(body) == {'value'}
+        assert set(orjson.loads(body['value'])) == {'001', '002', '003'}
+
+        rolled_back = await manager.rollback(steps=2)
+        assert len(rolled_back) == 2
+        assert len([r for r in server.requests if r[0] == 'PUT']) == 2
+        assert len(server.migration_records()) == 1
+
+    async def test_records_survive_a_new_manager(self, client):
+        """Test a second manager reads back what the first one recorded"""
+        first = MigrationManager(client)
+        self.add(first, [], 'a')
+        await first.migrate()
+
+        second = MigrationManager(client)
+        log = []
+        self.add(second, log, 'a')
+        assert await second.migrate() == []
+        assert log == []
+
+    async def test_parallel_group_runs_concurrently(self, client):
+        """Test consecutive parallel migrations overlap and others run alone"""
+        manager = MigrationManager(client)
+        log = []
+        self.add(manager, log, 'a', parallel=True)
+        self.add(manager, log, 'b', parallel=True)
+        self.add(manager, log, 'c')
+
+        await manager.migrate()
+        assert log[:2] == ['a:start', 'b:start']
+        assert log[-2:] == ['c:start', 'c:end']
+
+    async def test_parallel_group_partial_failure(self, server, client):
+        """Test a failing migration still records the ones that succeeded"""
+        manager = MigrationManager(client)
+        log = []
+        self.add(manager, log, 'a', parallel=True)
+        self.add(manager, log, 'b', parallel=True, fail=True)
+        self.add(manager, log, 'c')
+
+        with pytest.raises(RuntimeError, match='b failed'):
+            await manager.migrate()
+        assert 'c:start' not in log
+        assert set(server.migration_records()) == {'a'}
+        assert (await manager.status())['b'] == 'Pending'
+
+    async def test_groups_follow_registration_order(self, server, client):
+        """Test an applied sequential migration still separates parallel runs"""
+        server.redis['torm:migrations'] = orjson.dumps(orjson.dumps({
+            'b': {'id': 'b', 'name': 'b', 'applied_at': '2024-01-01T00:00:00'}
+        }).decode()).decode()
+        manager = MigrationManager(client)
+        log = []
+        self.add(manager, log, 'a', parallel=True)
+        self.add(manager, log, 'b')
+        self.add(manager, log, 'c', parallel=True)
+
+        assert await manager.migrate() == ['a', 'c']
+        assert log == ['a:start', 'a:end', 'c:start', 'c:end']
+
+    async def test_failed_write_keeps_cache(self, server, client):
+        """Test applied migrations are only cached once the write succeeded"""
+        manager = MigrationManager(client)
+        self.add(manager, [], 'a')
+        server.fail_writes = True
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await manager.migrate()
+        assert (await manager.status())['a'] == 'Pending'
+
+    async def test_failed_read_is_not_cached(self, server, client):
+        """Test an error reading the records raises instead of caching nothing"""
+        manager = MigrationManager(client)
+        server.redis['torm:migrations'] = orjson.dumps('{not json').decode()
+
+        with pytest.raises(RuntimeError):
+            await manager.status()
+        assert manager._applied is None
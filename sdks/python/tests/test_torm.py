@@ -6,7 +6,9 @@ Tests for ToonStore ORM Client
 
 import pytest
 import os
-from toonstore_torm import TormClient, ValidationError, TormError
+import uuid
+from toonstore_torm import TormClient, DocumentCache, ValidationError, TormError, NotFoundError
+from toonstore_torm.serialization import dumps, loads
 
 
 # Test configuration
@@ -16,16 +18,17 @@ TEST_CONFIG = {
 }
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def torm_client():
-    """Create a TORM client for testing"""
+    """Create a TORM client shared by the whole test session"""
     client = TormClient(**TEST_CONFIG)
     yield client
+    client.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def user_model(torm_client):
-    """Create a User model for testing"""
+    """Create a User model shared by the whole test session"""
     User = torm_client.model('TestUser', {
         'name': {'type': 'str', 'required': True, 'min_length': 3, 'max_length': 50},
         'email': {'type': 'str', 'required': True, 'email': True},
@@ -33,24 +36,18 @@ def user_model(torm_client):
         'website': {'type': 'str', 'url': True}
     })
     
-    # Clean up before tests
-    try:
-        User.delete_many()
-    except:
-        pass
-    
     yield User
     
-    # Clean up after tests
+    # Clean up after the session
     try:
-        User.delete_many()
+        User.truncate()
     except:
         pass
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def product_model(torm_client):
-    """Create a Product model for testing"""
+    """Create a Product model shared by the whole test session"""
     Product = torm_client.model('TestProduct', {
         'name': {'type': 'str', 'required': True},
         'price': {'type': 'float', 'required': True, 'min': 0},
@@ -58,21 +55,27 @@ def product_model(torm_client):
         'sku': {'type': 'str', 'required': True, 'pattern': r'^[A-Z]{3}-\d{5}$'}
     })
     
-    # Clean up before tests
-    try:
-        Product.delete_many()
-    except:
-        pass
-    
     yield Product
     
-    # Clean up after tests
+    # Clean up after the session
     try:
-        Product.delete_many()
+        Product.truncate()
     except:
         pass
 
 
+@pytest.fixture
+def id_prefix():
+    """Unique ID prefix isolating one test's documents in the shared collections"""
+    return f'test:{uuid.uuid4().hex[:8]}'
+
+
+@pytest.fixture
+def scoped_query(user_model, id_prefix):
+    """Query builder factory restricted to the current test's users"""
+    return lambda: user_model.query().filter('id', 'contains', id_prefix)
+
+
 class TestTormClient:
     """Test TormClient functionality"""
 
@@ -86,6 +89,19 @@ class TestTormClient:
         assert 'status' in health
         assert health['status'] in ['ok', 'healthy']
 
+    def test_health_check_is_cached(self):
+        """Test health results are reused within health_ttl"""
+        with TormClient(health_ttl=60, **TEST_CONFIG) as client:
+            client.health()['status'] = 'changed'
+            checked_at = client._health[0]
+            assert client.health()['status'] != 'changed'
+            assert client._health[0] == checked_at
+        with TormClient(**TEST_CONFIG) as client:
+            client.health()
+            checked_at = client._health[0]
+            client.health()
+            assert client._health[0] != checked_at
+
     def test_info_check(self, torm_client):
         """Test info endpoint"""
         info = torm_client.info()
@@ -102,116 +118,228 @@ class TestTormClient:
 class TestModelCRUD:
     """Test Model CRUD operations"""
 
-    def test_create_document(self, user_model):
+    def test_create_document(self, user_model, id_prefix):
         """Test creating a document"""
         user = user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
-        assert user['id'] == 'test:user:1'
+        assert user['id'] == f'{id_prefix}:user:1'
         assert user['name'] == 'Alice'
         assert user['email'] == 'alice@example.com'
         assert user['age'] == 30
 
-    def test_find_all_documents(self, user_model):
+    def test_create_with_numpy_values(self, user_model, id_prefix):
+        """Test numpy arrays and scalars are encoded in request bodies"""
+        np = pytest.importorskip('numpy')
+        user = user_model.create({
+            'id': f'{id_prefix}:user:1',
+            'name': 'Alice',
+            'email': 'alice@example.com',
+            'age': 30,
+            'scores': np.array([1.5, 2.5]),
+            'rank': np.int64(3)
+        })
+        assert user['scores'] == [1.5, 2.5]
+        assert user['rank'] == 3
+
+    def test_find_all_documents(self, user_model, id_prefix):
         """Test finding all documents"""
+        before = user_model.count()
         user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         user_model.create({
-            'id': 'test:user:2',
+            'id': f'{id_prefix}:user:2',
             'name': 'Bob',
             'email': 'bob@example.com',
             'age': 25
         })
         
-        users = user_model.find()
-        assert len(users) == 2
+        assert user_model.count() == before + 2
+
+        # The collection is shared, so only this test's documents are checked
+        documents = user_model.find()
+        assert documents.total == len(documents)
+        mine = {doc['id']: doc for doc in documents if doc['id'].startswith(id_prefix)}
+        assert mine == {
+            f'{id_prefix}:user:1': {
+                'id': f'{id_prefix}:user:1',
+                'name': 'Alice',
+                'email': 'alice@example.com',
+                'age': 30
+            },
+            f'{id_prefix}:user:2': {
+                'id': f'{id_prefix}:user:2',
+                'name': 'Bob',
+                'email': 'bob@example.com',
+                'age': 25
+            },
+        }
+
+    def test_find_with_projection(self, user_model, id_prefix):
+        """Test find() with a projection returns only those fields and the id"""
+        for i, name in enumerate(['Alice', 'Bob'], 1):
+            user_model.create({
+                'id': f'{id_prefix}:user:{i}',
+                'name': name,
+                'email': f'{name.lower()}@example.com',
+                'age': 20 + i
+            })
+
+        documents = user_model.find(projection=['name'])
+        mine = sorted(
+            (doc for doc in documents if doc['id'].startswith(id_prefix)),
+            key=lambda doc: doc['id']
+        )
+        assert mine == [
+            {'id': f'{id_prefix}:user:1', 'name': 'Alice'},
+            {'id': f'{id_prefix}:user:2', 'name': 'Bob'},
+        ]
+
+    def test_iter_documents(self, user_model, id_prefix):
+        """Test streaming all documents"""
+        user_model.create({
+            'id': f'{id_prefix}:user:1',
+            'name': 'Alice',
+            'email': 'alice@example.com',
+            'age': 30
+        })
+        user_model.create({
+            'id': f'{id_prefix}:user:2',
+            'name': 'Bob',
+            'email': 'bob@example.com',
+            'age': 25
+        })
+        
+        ids = {user.get('id') for user in user_model.iter()}
+        assert {f'{id_prefix}:user:1', f'{id_prefix}:user:2'} <= ids
 
-    def test_find_by_id(self, user_model):
+    def test_find_as_struct(self, user_model, id_prefix):
+        """Test decoding documents into typed structs"""
+        pytest.importorskip('msgspec')
+        from toonstore_torm.structs import DocumentStruct
+        
+        class UserStruct(DocumentStruct):
+            id: str = ''
+            name: str = ''
+            age: int = 0
+        
+        user_model.create({
+            'id': f'{id_prefix}:user:1',
+            'name': 'Alice',
+            'email': 'alice@example.com',
+            'age': 30
+        })
+        
+        users = user_model.find(as_struct=UserStruct)
+        alice = next(user for user in users if user.id == f'{id_prefix}:user:1')
+        assert isinstance(alice, UserStruct)
+        assert alice.age == 30
+        assert alice['name'] == 'Alice'
+        assert users.total == len(users)
+
+    def test_find_by_id(self, user_model, id_prefix):
         """Test finding document by ID"""
         created = user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         
-        found = user_model.find_by_id('test:user:1')
+        found = user_model.find_by_id(f'{id_prefix}:user:1')
         assert found is not None
         assert found['id'] == created['id']
         assert found['name'] == 'Alice'
 
-    def test_update_document(self, user_model):
+    def test_exists(self, user_model, id_prefix):
+        """Test checking whether a document exists"""
+        user_model.create({
+            'id': f'{id_prefix}:user:1',
+            'name': 'Alice',
+            'email': 'alice@example.com',
+            'age': 30
+        })
+        
+        assert user_model.exists(f'{id_prefix}:user:1')
+        assert not user_model.exists(f'{id_prefix}:user:missing')
+
+    def test_update_document(self, user_model, id_prefix):
         """Test updating a document"""
         user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         
-        updated = user_model.update('test:user:1', {'age': 31})
+        updated = user_model.update(f'{id_prefix}:user:1', {'age': 31})
         assert updated is not None
         assert updated['age'] == 31
 
-    def test_delete_document(self, user_model):
+    def test_update_missing_document(self, user_model, id_prefix):
+        """Test updating a missing document raises NotFoundError"""
+        with pytest.raises(NotFoundError):
+            user_model.update(f'{id_prefix}:user:missing', {'age': 31})
+
+    def test_delete_document(self, user_model, id_prefix):
         """Test deleting a document"""
         user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         
-        success = user_model.delete('test:user:1')
+        success = user_model.delete(f'{id_prefix}:user:1')
         assert success is True
         
-        found = user_model.find_by_id('test:user:1')
-        assert found is None
+        assert not user_model.exists(f'{id_prefix}:user:1')
 
-    def test_count_documents(self, user_model):
+    def test_count_documents(self, user_model, id_prefix):
         """Test counting documents"""
+        before = user_model.count()
         user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         user_model.create({
-            'id': 'test:user:2',
+            'id': f'{id_prefix}:user:2',
             'name': 'Bob',
             'email': 'bob@example.com',
             'age': 25
         })
         
         count = user_model.count()
-        assert count == 2
+        assert count == before + 2
 
-    def test_delete_all_documents(self, user_model):
+    def test_delete_all_documents(self, user_model, id_prefix, scoped_query):
         """Test deleting all documents"""
         user_model.create({
-            'id': 'test:user:1',
+            'id': f'{id_prefix}:user:1',
             'name': 'Alice',
             'email': 'alice@example.com',
             'age': 30
         })
         user_model.create({
-            'id': 'test:user:2',
+            'id': f'{id_prefix}:user:2',
             'name': 'Bob',
             'email': 'bob@example.com',
             'age': 25
         })
         
-        deleted = user_model.delete_many()
+        deleted = user_model.delete_many([f'{id_prefix}:user:1', f'{id_prefix}:user:2'])
         assert deleted == 2
         
-        count = user_model.count()
+        count = scoped_query().count()
         assert count == 0
 
 
@@ -310,10 +438,10 @@ class TestValidation:
                 'sku': 'invalid'  # Doesn't match pattern
             })
 
-    def test_valid_pattern(self, product_model):
+    def test_valid_pattern(self, product_model, id_prefix):
         """Test valid pattern passes"""
         product = product_model.create({
-            'id': 'test:product:1',
+            'id': f'{id_prefix}:product:1',
             'name': 'Laptop',
             'price': 999.99,
             'stock': 10,
@@ -321,107 +449,136 @@ class TestValidation:
         })
         assert product['sku'] == 'LAP-12345'
 
+    def test_native_validator_matches_python(self, user_model):
+        """Test the native validator raises the same errors as the Python one"""
+        from toonstore_torm import validation
+        if validation._speedups is None:
+            pytest.skip('native validation extension not built')
+        
+        native = validation._native_validator(user_model.schema)
+        generated = validation._generate_validator(user_model.schema)
+        documents = [
+            {'name': 'Alice', 'email': 'alice@example.com', 'age': 30},
+            {'name': 'Al', 'email': 'alice@example.com', 'age': 30},
+            {'name': 'Alice', 'email': 'invalid', 'age': 30},
+            {'name': 'Alice', 'email': 'alice@example.com', 'age': 5},
+            {'name': 'Alice', 'age': '30'},
+            {'age': 200},
+        ]
+        
+        def error(validate, doc, partial):
+            try:
+                validate(doc, partial=partial)
+            except ValidationError as e:
+                return str(e)
+            return None
+        
+        for doc in documents:
+            for partial in (False, True):
+                assert error(native, doc, partial) == error(generated, doc, partial)
+
 
 class TestQueryBuilder:
     """Test Query Builder functionality"""
 
     @pytest.fixture(autouse=True)
-    def setup_test_data(self, user_model):
+    def setup_test_data(self, user_model, id_prefix):
         """Create test data before each test"""
-        user_model.delete_many()
-        
-        user_model.create({
-            'id': 'test:user:1',
-            'name': 'Alice',
-            'email': 'alice@example.com',
-            'age': 30
-        })
-        user_model.create({
-            'id': 'test:user:2',
-            'name': 'Bob',
-            'email': 'bob@example.com',
-            'age': 25
-        })
-        user_model.create({
-            'id': 'test:user:3',
-            'name': 'Charlie',
-            'email': 'charlie@example.com',
-            'age': 35
-        })
-        user_model.create({
-            'id': 'test:user:4',
-            'name': 'Diana',
-            'email': 'diana@example.com',
-            'age': 28
-        })
-
-    def test_filter_equals(self, user_model):
+        user_model.create_many([
+            {
+                'id': f'{id_prefix}:user:1',
+                'name': 'Alice',
+                'email': 'alice@example.com',
+                'age': 30
+            },
+            {
+                'id': f'{id_prefix}:user:2',
+                'name': 'Bob',
+                'email': 'bob@example.com',
+                'age': 25
+            },
+            {
+                'id': f'{id_prefix}:user:3',
+                'name': 'Charlie',
+                'email': 'charlie@example.com',
+                'age': 35
+            },
+            {
+                'id': f'{id_prefix}:user:4',
+                'name': 'Diana',
+                'email': 'diana@example.com',
+                'age': 28
+            }
+        ])
+
+    def test_filter_equals(self, scoped_query):
         """Test filter with equals operator"""
-        results = user_model.query().filter('age', 'eq', 30).exec()
+        results = scoped_query().filter('age', 'eq', 30).exec()
         assert len(results) == 1
         assert results[0]['name'] == 'Alice'
 
-    def test_filter_greater_than(self, user_model):
+    def test_filter_greater_than(self, scoped_query):
         """Test filter with greater than operator"""
-        results = user_model.query().filter('age', 'gt', 30).exec()
+        results = scoped_query().filter('age', 'gt', 30).exec()
         assert len(results) == 1
         assert results[0]['name'] == 'Charlie'
 
-    def test_filter_greater_than_or_equal(self, user_model):
+    def test_filter_greater_than_or_equal(self, scoped_query):
         """Test filter with greater than or equal operator"""
-        results = user_model.query().filter('age', 'gte', 30).exec()
+        results = scoped_query().filter('age', 'gte', 30).exec()
         assert len(results) == 2
 
-    def test_filter_less_than(self, user_model):
+    def test_filter_less_than(self, scoped_query):
         """Test filter with less than operator"""
-        results = user_model.query().filter('age', 'lt', 30).exec()
+        results = scoped_query().filter('age', 'lt', 30).exec()
         assert len(results) == 2
 
-    def test_filter_less_than_or_equal(self, user_model):
+    def test_filter_less_than_or_equal(self, scoped_query):
         """Test filter with less than or equal operator"""
-        results = user_model.query().filter('age', 'lte', 30).exec()
+        results = scoped_query().filter('age', 'lte', 30).exec()
         assert len(results) == 3
 
-    def test_filter_contains(self, user_model):
+    def test_filter_contains(self, scoped_query):
         """Test filter with contains operator"""
-        results = user_model.query().filter('email', 'contains', 'alice').exec()
+        results = scoped_query().filter('email', 'contains', 'alice').exec()
         assert len(results) == 1
         assert results[0]['name'] == 'Alice'
 
-    def test_chained_filters(self, user_model):
+    def test_chained_filters(self, scoped_query):
         """Test chaining multiple filters"""
-        results = user_model.query() \
+        results = scoped_query() \
             .filter('age', 'gte', 25) \
             .filter('age', 'lte', 30) \
             .exec()
         assert len(results) == 3
 
-    def test_sort_ascending(self, user_model):
+    def test_sort_ascending(self, scoped_query):
         """Test sorting in ascending order"""
-        results = user_model.query().sort('age', 'asc').exec()
+        results = scoped_query().sort('age', 'asc').exec()
         assert results[0]['name'] == 'Bob'
         assert results[-1]['name'] == 'Charlie'
 
-    def test_sort_descending(self, user_model):
+    def test_sort_descending(self, scoped_query):
         """Test sorting in descending order"""
-        results = user_model.query().sort('age', 'desc').exec()
+        results = scoped_query().sort('age', 'desc').exec()
         assert results[0]['name'] == 'Charlie'
         assert results[-1]['name'] == 'Bob'
 
-    def test_limit_results(self, user_model):
+    def test_limit_results(self, scoped_query):
         """Test limiting results"""
-        results = user_model.query().limit(2).exec()
+        results = scoped_query().limit(2).exec()
         assert len(results) == 2
+        assert results.total == 4
 
-    def test_skip_results(self, user_model):
+    def test_skip_results(self, scoped_query):
         """Test skipping results"""
-        results = user_model.query().sort('age', 'asc').skip(2).exec()
+        results = scoped_query().sort('age', 'asc').skip(2).exec()
         assert len(results) == 2
         assert results[0]['age'] >= 30
 
-    def test_combined_query(self, user_model):
+    def test_combined_query(self, scoped_query):
         """Test combining filter, sort, limit, and skip"""
-        results = user_model.query() \
+        results = scoped_query() \
             .filter('age', 'gte', 25) \
             .sort('age', 'asc') \
             .skip(1) \
@@ -430,18 +587,151 @@ class TestQueryBuilder:
         assert len(results) == 2
         assert results[0]['age'] == 28
 
-    def test_count_filtered_results(self, user_model):
+    def test_count_filtered_results(self, scoped_query):
         """Test counting filtered results"""
-        count = user_model.query().filter('age', 'gte', 30).count()
+        count = scoped_query().filter('age', 'gte', 30).count()
         assert count == 2
 
-    def test_where_shorthand(self, user_model):
+    def test_count_applies_skip_and_limit(self, scoped_query):
+        """Test counting respects skip and limit like exec"""
+        assert scoped_query().filter('age', 'gte', 25).skip(1).limit(2).count() == 2
+        assert scoped_query().filter('age', 'gte', 30).skip(1).count() == 1
+
+    def test_iter_query_results(self, scoped_query):
+        """Test streaming query results"""
+        query = scoped_query().filter('age', 'gte', 28).sort('age', 'asc').project(['name'])
+        names = [user['name'] for user in query.iter()]
+        assert names == ['Diana', 'Alice', 'Charlie']
+
+    def test_exec_as_struct(self, scoped_query):
+        """Test decoding query results into typed structs"""
+        pytest.importorskip('msgspec')
+        from toonstore_torm.structs import DocumentStruct
+        
+        class UserStruct(DocumentStruct):
+            id: str = ''
+            name: str = ''
+            age: int = 0
+        
+        results = scoped_query().sort('age', 'desc').limit(2).exec(as_struct=UserStruct)
+        assert [user.name for user in results] == ['Charlie', 'Alice']
+        assert results.total == 4
+
+    def test_client_side_query(self, scoped_query):
+        """Test re-applying filters and sort order on the client"""
+        query = scoped_query().filter('age', 'gt', 25).sort('age', 'desc').project(['name'])
+        query.client_side = True
+        results = query.exec()
+        assert [user['name'] for user in results] == ['Charlie', 'Alice', 'Diana']
+        assert set(results[0]) == {'id', 'name'}
+        assert query.count() == 3
+
+    def test_project_fields(self, scoped_query):
+        """Test projecting query results to selected fields"""
+        results = scoped_query() \
+            .filter('age', 'gte', 30) \
+            .project(['name']) \
+            .exec()
+        assert len(results) == 2
+        for user in results:
+            assert set(user) == {'id', 'name'}
+
+    def test_filter_indexes_numeric_fields(self, user_model, scoped_query):
+        """Test filtering requests an index on numeric schema fields only"""
+        results = scoped_query() \
+            .filter('age', 'gte', 30) \
+            .filter('email', 'contains', 'example.com') \
+            .exec()
+        assert len(results) == 2
+        assert 'age' in user_model._indexed
+        assert 'email' not in user_model._indexed
+
+    def test_where_shorthand(self, scoped_query):
         """Test where shorthand for equals"""
-        results = user_model.query().where('name', 'Bob').exec()
+        results = scoped_query().where('name', 'Bob').exec()
         assert len(results) == 1
         assert results[0]['email'] == 'bob@example.com'
 
 
+class TestDocumentCache:
+    """Test client-side document cache"""
+
+    def test_cache_expires_entries(self):
+        """Test cached documents expire after the TTL"""
+        cache = DocumentCache(ttl=0)
+        cache.set('user', 'user:1', {'id': 'user:1'})
+        assert cache.get('user', 'user:1') is None
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the oldest entry is evicted when the cache is full"""
+        cache = DocumentCache(maxsize=2)
+        cache.set('user', 'user:1', {'id': 'user:1'})
+        cache.set('user', 'user:2', {'id': 'user:2'})
+        cache.get('user', 'user:1')
+        cache.set('user', 'user:3', {'id': 'user:3'})
+        assert cache.get('user', 'user:2') is None
+        assert cache.get('user', 'user:1') is not None
+
+    def test_cache_shared_between_threads(self):
+        """Test concurrent writers and readers keep the cache consistent"""
+        from concurrent.futures import ThreadPoolExecutor
+        cache = DocumentCache(maxsize=8)
+
+        def churn(n):
+            for i in range(500):
+                cache.set('user', f'user:{(n + i) % 32}', {'id': i})
+                cache.get('user', f'user:{i % 32}')
+                cache.pop('user', f'user:{(n * i) % 32}')
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(churn, range(16)))
+        assert len(cache) <= 8
+
+    def test_cached_find_by_id_is_invalidated_on_delete(self, id_prefix):
+        """Test deleting a document drops it from the cache"""
+        with TormClient(cache=True, **TEST_CONFIG) as torm:
+            User = torm.model('TestUser')
+            User.create({'id': f'{id_prefix}:user:cache', 'name': 'Alice'})
+            assert User.find_by_id(f'{id_prefix}:user:cache')['name'] == 'Alice'
+
+            User.delete(f'{id_prefix}:user:cache')
+            assert User.find_by_id(f'{id_prefix}:user:cache') is None
+
+    def test_read_during_update_is_not_cached(self, id_prefix):
+        """Test a read racing an update does not leave the old document cached"""
+        with TormClient(cache=True, **TEST_CONFIG) as torm:
+            User = torm.model('TestUser')
+            doc_id = f'{id_prefix}:user:race'
+            User.create({'id': doc_id, 'name': 'Alice'})
+            put = torm.session.put
+
+            def put_after_read(*args, **kwargs):
+                # Another thread reads the document before the write lands
+                User.find_by_id(doc_id)
+                return put(*args, **kwargs)
+
+            torm.session.put = put_after_read
+            User.update(doc_id, {'id': doc_id, 'name': 'Alicia'})
+            assert User.find_by_id(doc_id)['name'] == 'Alicia'
+
+
+class TestSerialization:
+    """Test request body encoding"""
+
+    def test_dumps_non_string_keys(self):
+        """Test dict keys that are not strings are encoded as strings"""
+        assert loads(dumps({1: 'a', 'b': {2.5: True}})) == {'1': 'a', 'b': {'2.5': True}}
+
+    def test_dumps_big_integers(self):
+        """Test integers wider than 64 bits are encoded"""
+        assert dumps({'n': 2 ** 64 + 1}) == b'{"n":18446744073709551617}'
+
+    def test_dumps_unsupported_type(self):
+        """Test unserializable values raise TormError"""
+        with pytest.raises(TormError):
+            dumps({'value': object()})
+
+
 class TestContextManager:
     """Test context manager functionality"""
 
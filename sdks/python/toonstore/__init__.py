@@ -5,15 +5,62 @@ Mongoose-style ORM for ToonStore with type-safe models,
 validation, and relationships.
 """
 
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
 import json
-from typing import Any, Dict, List, Optional, Type, TypeVar
-from dataclasses import dataclass, field, asdict
 import httpx
+import orjson
 from datetime import datetime
 
 __version__ = "0.1.0"
 
 T = TypeVar('T', bound='Model')
+R = TypeVar('R')
+
+# Request bodies are encoded with orjson and sent as raw content so httpx
+# does not re-encode them with the stdlib json module. numpy arrays and
+# scalars are encoded natively; values orjson rejects (integers wider than
+# 64 bits) go through the stdlib instead.
+def _dumps(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+_loads = orjson.loads
+
+
+def run(main: Awaitable[R]) -> R:
+    """
+    Run a coroutine on the fastest available event loop
+    
+    Uses uvloop when it is installed (``pip install toonstore[uvloop]``)
+    and falls back to the stock asyncio loop otherwise. Use it in place of
+    ``asyncio.run()`` as the entry point of scripts built on the SDK.
+    
+    Args:
+        main: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+async def _gather_limited(limit: int, aws: Iterable[Awaitable[R]]) -> List[R]:
+    """Await several awaitables concurrently with at most ``limit`` in flight"""
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run_one(aw: Awaitable[R]) -> R:
+        async with semaphore:
+            return await aw
+    
+    return list(await asyncio.gather(*(run_one(aw) for aw in aws)))
 
 
 class ValidationError(Exception):
@@ -21,18 +68,50 @@ class ValidationError(Exception):
     pass
 
 
+class DocumentList(List[T]):
+    """List of model instances that also carries the server-side match count"""
+    
+    def __init__(self, items: List[T], total: Optional[int] = None):
+        super().__init__(items)
+        self.total = len(items) if total is None else total
+    
+    @property
+    def items(self) -> List[T]:
+        """The instances as a plain list"""
+        return list(self)
+
+
 class TormClient:
     """TORM client for connecting to ToonStore"""
     
-    def __init__(self, base_url: str = "http://localhost:3001"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3001",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_concurrency: int = 50,
+    ):
         """
         Initialize TORM client
         
         Args:
             base_url: Base URL of TORM server
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            max_concurrency: Maximum in-flight requests for fan-out helpers
+                such as Model.find_many()
         """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.max_concurrency = max_concurrency
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={'Content-Type': 'application/json'},
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
     
     async def close(self):
         """Close the HTTP client"""
@@ -45,16 +124,72 @@ class TormClient:
         await self.close()
 
 
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Instance attributes declared via ``__slots__`` anywhere in a class's MRO"""
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in names)
+    return tuple(names)
+
+
+_MISSING = object()
+
+
+def _dump_value(value: Any) -> Any:
+    """Convert a field value for ``Model.to_dict``"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Model):
+        return value.to_dict()
+    return value
+
+
 class Model:
-    """Base model class for TORM"""
+    """
+    Base model class for TORM
+    
+    Subclasses may declare ``__slots__`` for their fields to drop the
+    per-instance ``__dict__``, which noticeably cuts memory when loading
+    many documents:
+    
+        class User(Model):
+            __slots__ = ('id', 'name', 'email')
+    
+    Documents loaded into such a model keep only the declared fields;
+    other fields stored on the server are dropped.
+    """
+    
+    __slots__ = ()
     
     _collection: str = ""
     _client: Optional[TormClient] = None
+    # Collection paths are built once in set_collection()
+    _path: str = "/api/"
+    _doc_path: str = "/api//"
+    # Public slot names, computed once per subclass
+    _fields: Tuple[str, ...] = ()
+    # Whether instances have a __dict__ to hold undeclared fields
+    _has_dict: bool = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(name for name in _slot_names(cls) if not name.startswith('_'))
+        cls._has_dict = cls.__dictoffset__ != 0
     
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
     
+    @classmethod
+    def _from_document(cls: Type[T], doc: Dict[str, Any]) -> T:
+        """Build an instance from a stored document"""
+        if cls._has_dict:
+            return cls(**doc)
+        return cls(**{key: value for key, value in doc.items() if key in cls._fields})
+    
     @classmethod
     def set_client(cls, client: TormClient):
         """Set the TORM client for this model"""
@@ -64,6 +199,8 @@ class Model:
     def set_collection(cls, collection: str):
         """Set the collection name for this model"""
         cls._collection = collection
+        cls._path = f"/api/{collection}"
+        cls._doc_path = cls._path + "/"
     
     @classmethod
     async def create(cls: Type[T], data: Dict[str, Any]) -> T:
@@ -80,12 +217,37 @@ class Model:
             raise ValueError("Client not set. Call Model.set_client() first")
         
         response = await cls._client.client.post(
-            f"{cls._client.base_url}/api/{cls._collection}",
-            json={"data": data}
+            cls._client.base_url + cls._path,
+            content=_dumps({"data": data})
+        )
+        response.raise_for_status()
+        result = _loads(response.content)
+        return cls._from_document(result['data'])
+    
+    @classmethod
+    async def create_many(cls: Type[T], data: List[Dict[str, Any]]) -> List[T]:
+        """
+        Create several documents in a single request
+        
+        Args:
+            data: List of document data
+        
+        Returns:
+            List of created model instances
+        """
+        if not cls._client:
+            raise ValueError("Client not set. Call Model.set_client() first")
+        
+        if not data:
+            return []
+        
+        response = await cls._client.client.post(
+            cls._client.base_url + cls._path + "/batch",
+            content=_dumps({"data": data})
         )
         response.raise_for_status()
-        result = response.json()
-        return cls(**result['data'])
+        result = _loads(response.content)
+        return [cls._from_document(doc) for doc in result.get('data', [])]
     
     async def save(self) -> 'Model':
         """
@@ -97,25 +259,27 @@ class Model:
         if not self._client:
             raise ValueError("Client not set. Call Model.set_client() first")
         
-        data = self.to_dict()
+        body = _dumps({"data": self.to_dict()})
+        doc_id = getattr(self, 'id', None)
         
-        if hasattr(self, 'id') and self.id:
+        if doc_id:
             # Update existing
             response = await self._client.client.put(
-                f"{self._client.base_url}/api/{self._collection}/{self.id}",
-                json={"data": data}
+                self._client.base_url + self._doc_path + str(doc_id),
+                content=body
             )
+            response.raise_for_status()
         else:
-            # Create new
+            # Create new; check the status before parsing the body
             response = await self._client.client.post(
-                f"{self._client.base_url}/api/{self._collection}",
-                json={"data": data}
+                self._client.base_url + self._path,
+                content=body
             )
-            result = response.json()
+            response.raise_for_status()
+            result = _loads(response.content)
             if 'id' in result:
                 self.id = result['id']
         
-        response.raise_for_status()
         return self
     
     @classmethod
@@ -134,18 +298,63 @@ class Model:
         
         try:
             response = await cls._client.client.get(
-                f"{cls._client.base_url}/api/{cls._collection}/{id}"
+                cls._client.base_url + cls._doc_path + id
             )
             response.raise_for_status()
-            data = response.json()
-            return cls(**data)
+            data = _loads(response.content)
+            return cls._from_document(data)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
             raise
     
     @classmethod
-    async def find(cls: Type[T], filters: Optional[Dict[str, Any]] = None) -> List[T]:
+    async def find_many(cls: Type[T], ids: List[str]) -> List[T]:
+        """
+        Find several documents by ID concurrently
+        
+        Lookups share the client's connection pool, with at most
+        ``max_concurrency`` requests in flight.
+        
+        Args:
+            ids: Document IDs
+            
+        Returns:
+            Model instances for the IDs that exist, in the order given
+        """
+        if not cls._client:
+            raise ValueError("Client not set. Call Model.set_client() first")
+        
+        found = await _gather_limited(
+            cls._client.max_concurrency,
+            (cls.find_by_id(id) for id in ids),
+        )
+        return [instance for instance in found if instance is not None]
+    
+    @classmethod
+    async def exists(cls, id: str) -> bool:
+        """
+        Check whether a document exists without downloading it
+        
+        Args:
+            id: Document ID
+            
+        Returns:
+            True if the document exists
+        """
+        if not cls._client:
+            raise ValueError("Client not set. Call Model.set_client() first")
+        
+        response = await cls._client.client.head(
+            cls._client.base_url + cls._doc_path + id
+        )
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+    
+    @classmethod
+    async def find(cls: Type[T], filters: Optional[Dict[str, Any]] = None) -> DocumentList[T]:
         """
         Find documents matching filters
         
@@ -153,24 +362,28 @@ class Model:
             filters: Query filters
             
         Returns:
-            List of model instances
+            List of model instances; ``total`` counts all matches
         """
         if not cls._client:
             raise ValueError("Client not set. Call Model.set_client() first")
         
         if filters:
             response = await cls._client.client.post(
-                f"{cls._client.base_url}/api/{cls._collection}/query",
-                json={"filters": filters}
+                cls._client.base_url + cls._path + "/query",
+                content=_dumps({"filters": filters})
             )
         else:
             response = await cls._client.client.get(
-                f"{cls._client.base_url}/api/{cls._collection}"
+                cls._client.base_url + cls._path
             )
         
         response.raise_for_status()
-        result = response.json()
-        return [cls(**doc) for doc in result.get('documents', [])]
+        result = _loads(response.content)
+        documents = result.get('documents', [])
+        return DocumentList(
+            [cls._from_document(doc) for doc in documents],
+            total=result.get('total', result.get('count')),
+        )
     
     @classmethod
     async def count(cls) -> int:
@@ -184,10 +397,10 @@ class Model:
             raise ValueError("Client not set. Call Model.set_client() first")
         
         response = await cls._client.client.get(
-            f"{cls._client.base_url}/api/{cls._collection}/count"
+            cls._client.base_url + cls._path + "/count"
         )
         response.raise_for_status()
-        result = response.json()
+        result = _loads(response.content)
         return result.get('count', 0)
     
     async def delete(self) -> bool:
@@ -200,27 +413,28 @@ class Model:
         if not self._client:
             raise ValueError("Client not set. Call Model.set_client() first")
         
-        if not hasattr(self, 'id') or not self.id:
+        doc_id = getattr(self, 'id', None)
+        if not doc_id:
             return False
         
         response = await self._client.client.delete(
-            f"{self._client.base_url}/api/{self._collection}/{self.id}"
+            self._client.base_url + self._doc_path + str(doc_id)
         )
         response.raise_for_status()
-        result = response.json()
+        result = _loads(response.content)
         return result.get('success', False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
         result = {}
-        for key, value in self.__dict__.items():
+        for key, value in getattr(self, '__dict__', {}).items():
             if not key.startswith('_'):
-                if isinstance(value, datetime):
-                    result[key] = value.isoformat()
-                elif isinstance(value, Model):
-                    result[key] = value.to_dict()
-                else:
-                    result[key] = value
+                result[key] = _dump_value(value)
+        
+        for key in self._fields:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                result[key] = _dump_value(value)
         return result
     
     def __repr__(self) -> str:
@@ -234,13 +448,19 @@ class MigrationManager:
     def __init__(self, client: TormClient):
         self.client = client
         self.migrations: List[Dict[str, Any]] = []
+        # Records live in a plain key, which only the studio key API serves
+        self._url = f"{client.base_url}/studio/api/keys/torm:migrations"
+        # Applied migration records, loaded on first use and kept in sync
+        # by migrate()/rollback() so later calls need no round trip
+        self._applied: Optional[Dict[str, Dict[str, Any]]] = None
     
     def add_migration(
         self,
         id: str,
         name: str,
         up: callable,
-        down: callable
+        down: callable,
+        parallel: bool = False
     ):
         """
         Add a migration
@@ -250,12 +470,15 @@ class MigrationManager:
             name: Migration name
             up: Function to apply migration
             down: Function to rollback migration
+            parallel: The migration does not depend on its neighbours;
+                consecutive parallel migrations run concurrently
         """
         self.migrations.append({
             'id': id,
             'name': name,
             'up': up,
-            'down': down
+            'down': down,
+            'parallel': parallel
         })
     
     async def migrate(self) -> List[str]:
@@ -265,22 +488,46 @@ class MigrationManager:
         Returns:
             List of applied migration names
         """
-        applied = await self._get_applied_migrations()
+        # Work on a copy; the cache only changes once the records are saved
+        applied = dict(await self._get_applied_migrations())
+        # Groups follow registration order, so an applied migration still
+        # separates the parallel runs around it
+        groups = [
+            [m for m in group if m['id'] not in applied]
+            for group in self._groups(self.migrations)
+        ]
         newly_applied = []
         
-        for migration in self.migrations:
-            if migration['id'] not in applied:
-                # Run migration
-                await migration['up'](self.client)
+        try:
+            for group in filter(None, groups):
+                # Run migration(s); a group of parallel ones runs concurrently
+                results = await asyncio.gather(
+                    *(migration['up'](self.client) for migration in group),
+                    return_exceptions=True
+                )
                 
-                # Record migration
-                await self._save_migration({
-                    'id': migration['id'],
-                    'name': migration['name'],
-                    'applied_at': datetime.now().isoformat()
-                })
+                error = None
+                for migration, result in zip(group, results):
+                    if isinstance(result, BaseException):
+                        error = error or result
+                        continue
+                    
+                    # Record migration
+                    applied[migration['id']] = {
+                        'id': migration['id'],
+                        'name': migration['name'],
+                        'applied_at': datetime.now().isoformat()
+                    }
+                    
+                    newly_applied.append(migration['name'])
                 
-                newly_applied.append(migration['name'])
+                if error is not None:
+                    raise error
+        finally:
+            # One write for the whole run; migrations that ran before a
+            # failure are still recorded
+            if newly_applied:
+                await self._save_migrations(applied)
         
         return newly_applied
     
@@ -294,7 +541,7 @@ class MigrationManager:
         Returns:
             List of rolled back migration names
         """
-        applied = await self._get_applied_migrations()
+        applied = dict(await self._get_applied_migrations())
         rolled_back = []
         
         # Sort by applied_at descending
@@ -304,23 +551,38 @@ class MigrationManager:
             reverse=True
         )
         
-        for record in sorted_migrations[:steps]:
-            # Find migration
-            migration = next(
-                (m for m in self.migrations if m['id'] == record['id']),
-                None
-            )
-            
-            if migration:
-                # Run down migration
-                await migration['down'](self.client)
+        try:
+            for record in sorted_migrations[:steps]:
+                # Find migration
+                migration = next(
+                    (m for m in self.migrations if m['id'] == record['id']),
+                    None
+                )
                 
-                # Remove migration record
-                await self._remove_migration(record['id'])
-                rolled_back.append(record['name'])
+                if migration:
+                    # Run down migration
+                    await migration['down'](self.client)
+                    
+                    # Remove migration record
+                    del applied[record['id']]
+                    rolled_back.append(record['name'])
+        finally:
+            if rolled_back:
+                await self._save_migrations(applied)
         
         return rolled_back
     
+    @staticmethod
+    def _groups(migrations: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split migrations into runs of consecutive parallel ones; others run alone"""
+        groups: List[List[Dict[str, Any]]] = []
+        for migration in migrations:
+            if migration.get('parallel') and groups and groups[-1][0].get('parallel'):
+                groups[-1].append(migration)
+            else:
+                groups.append([migration])
+        return groups
+    
     async def status(self) -> Dict[str, str]:
         """
         Get migration status
@@ -341,43 +603,56 @@ class MigrationManager:
         return status
     
     async def _get_applied_migrations(self) -> Dict[str, Dict[str, Any]]:
-        """Get applied migrations from database"""
+        """
+        Get applied migrations, fetching them from the database once
+        
+        Raises:
+            RuntimeError: If the records cannot be loaded; nothing is cached,
+                so pending migrations are never guessed from a failed read
+        """
+        if self._applied is not None:
+            return self._applied
+        
         try:
             response = await self.client.client.get(
-                f"{self.client.base_url}/api/keys/torm:migrations"
+                self._url
             )
-            if response.status_code == 200:
-                data = response.json()
-                return json.loads(data.get('value', '{}'))
-        except:
-            pass
-        return {}
-    
-    async def _save_migration(self, migration: Dict[str, Any]):
-        """Save migration record"""
-        migrations = await self._get_applied_migrations()
-        migrations[migration['id']] = migration
-        
-        await self.client.client.put(
-            f"{self.client.base_url}/api/keys/torm:migrations",
-            json={"value": json.dumps(migrations)}
-        )
+            if response.status_code == 404:
+                # No migration has been recorded yet
+                applied = {}
+            else:
+                response.raise_for_status()
+                data = _loads(response.content)
+                applied = _loads(data.get('value', '{}'))
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            raise RuntimeError(f"Failed to load applied migrations: {e}") from e
+        
+        self._applied = applied
+        return applied
     
-    async def _remove_migration(self, migration_id: str):
-        """Remove migration record"""
-        migrations = await self._get_applied_migrations()
-        if migration_id in migrations:
-            del migrations[migration_id]
-            
-            await self.client.client.put(
-                f"{self.client.base_url}/api/keys/torm:migrations",
-                json={"value": json.dumps(migrations)}
-            )
-
+    async def _save_migrations(self, migrations: Dict[str, Dict[str, Any]]):
+        """
+        Write the applied migration records back in a single request
+        
+        The cached records are replaced only once the write succeeded.
+        
+        Raises:
+            RuntimeError: If the server did not store the records
+        """
+        response = await self.client.client.put(
+            self._url,
+            content=_dumps({"value": _dumps(migrations).decode()})
+        )
+        response.raise_for_status()
+        if not _loads(response.content).get('success'):
+            raise RuntimeError("Failed to save applied migrations")
+        self._applied = migrations
 
 __all__ = [
+    'run',
     'TormClient',
     'Model',
     'MigrationManager',
+    'DocumentList',
     'ValidationError',
 ]
@@ -6,8 +6,12 @@ A Mongoose-style ORM client for ToonStore database.
 
 from .client import TormClient
 from .model import Model
-from .query import QueryBuilder
-from .exceptions import ValidationError, TormError
+from .query import QueryBuilder, DocumentList
+from .cache import DocumentCache
+from .exceptions import ValidationError, TormError, ConnectionError, NotFoundError
 
 __version__ = "0.1.0"
-__all__ = ["TormClient", "Model", "QueryBuilder", "ValidationError", "TormError"]
+__all__ = [
+    "TormClient", "Model", "QueryBuilder", "DocumentList", "DocumentCache",
+    "ValidationError", "TormError", "ConnectionError", "NotFoundError"
+]
@@ -0,0 +1,107 @@
+"""Document cache for TORM"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+
+class DocumentCache:
+    """
+    Least-recently-used cache of documents keyed by (collection, id)
+    
+    Entries expire after ``ttl`` seconds and the oldest entries are evicted
+    once ``maxsize`` is reached. Safe to share between threads.
+    
+    Example:
+        >>> cache = DocumentCache(maxsize=100, ttl=30)
+        >>> cache.set('user', 'user:1', {'id': 'user:1', 'name': 'Alice'})
+        >>> cache.get('user', 'user:1')
+        {'id': 'user:1', 'name': 'Alice'}
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize: Maximum number of cached documents (default: 1024)
+            ttl: Seconds before an entry expires (default: 60)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached document
+        
+        Args:
+            collection: Collection name
+            doc_id: Document ID
+        
+        Returns:
+            Copy of the cached document or None on a miss
+        """
+        key = (collection, doc_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, doc = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+        return dict(doc)
+    
+    def set(self, collection: str, doc_id: str, doc: Dict[str, Any]):
+        """
+        Cache a document
+        
+        Args:
+            collection: Collection name
+            doc_id: Document ID
+            doc: Document data
+        """
+        key = (collection, doc_id)
+        entry = (time.monotonic(), dict(doc))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, collection: str, doc_id: str):
+        """
+        Remove a document from the cache
+        
+        Args:
+            collection: Collection name
+            doc_id: Document ID
+        """
+        with self._lock:
+            self._entries.pop((collection, doc_id), None)
+    
+    def invalidate(self, doc_id: Optional[str] = None, collection: Optional[str] = None):
+        """
+        Remove matching documents from the cache
+        
+        Args:
+            doc_id: Only remove documents with this ID
+            collection: Only remove documents from this collection
+        """
+        with self._lock:
+            if doc_id is None and collection is None:
+                self._entries.clear()
+                return
+            
+            for key in list(self._entries):
+                if (collection is None or key[0] == collection) and (doc_id is None or key[1] == doc_id):
+                    del self._entries[key]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
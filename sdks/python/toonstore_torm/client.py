@@ -1,9 +1,18 @@
 """TormClient - Main client for connecting to ToonStore"""
 
-import requests
-from typing import Optional, Dict, Any
+import httpx
+import time
+from typing import Optional, Dict, Any, Tuple
 from .model import Model
-from .exceptions import ConnectionError
+from .cache import DocumentCache
+from .exceptions import ConnectionError, http_errors
+from .serialization import loads
+
+
+def _raise_for_error_status(response: httpx.Response) -> None:
+    """Response hook raising HTTPStatusError for 4xx and 5xx responses"""
+    if response.status_code >= 400:
+        response.raise_for_status()
 
 
 class TormClient:
@@ -18,18 +27,58 @@ class TormClient:
         ... })
     """
     
-    def __init__(self, base_url: str = 'http://localhost:3001', timeout: int = 5):
+    def __init__(self, base_url: str = 'http://localhost:3001', timeout: int = 5,
+                 cache: bool = False, cache_ttl: float = 60.0, cache_size: int = 1024,
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 http2: bool = True, auto_index: bool = True,
+                 health_ttl: float = 0.0, info_ttl: float = 60.0):
         """
         Initialize TORM client
         
         Args:
             base_url: Base URL of TORM server (default: http://localhost:3001)
             timeout: Request timeout in seconds (default: 5)
+            cache: Cache documents looked up by ID (default: False)
+            cache_ttl: Seconds a cached document stays valid (default: 60)
+            cache_size: Maximum number of cached documents (default: 1024)
+            max_connections: Maximum number of concurrent connections (default: 100)
+            max_keepalive_connections: Idle connections kept open for reuse (default: 20)
+            http2: Negotiate HTTP/2 with https:// servers that support it;
+                plain http:// URLs always use HTTP/1.1 (default: True)
+            auto_index: Index numeric schema fields the first time a query
+                filters on them (default: True)
+            health_ttl: Seconds a health() result is reused (default: 0,
+                always ask the server)
+            info_ttl: Seconds an info() result is reused (default: 60)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({'Content-Type': 'application/json'})
+        self.auto_index = auto_index
+        self.health_ttl = health_ttl
+        self.info_ttl = info_ttl
+        # (monotonic time, result) of the last health()/info() response
+        self._health: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._info: Optional[Tuple[float, Dict[str, Any]]] = None
+        self.cache: Optional[DocumentCache] = (
+            DocumentCache(maxsize=cache_size, ttl=cache_ttl) if cache else None
+        )
+        
+        # One pooled client for every call; keep-alive connections are
+        # reused, and over https:// HTTP/2 multiplexes concurrent requests
+        # over one socket (httpx only negotiates it through TLS ALPN).
+        # Error statuses raise as soon as a response arrives, so callers
+        # only wrap requests in http_errors()
+        self.session = httpx.Client(
+            http2=http2,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={'Content-Type': 'application/json'},
+            event_hooks={'response': [_raise_for_error_status]},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
     
     def model(self, name: str, schema: Optional[Dict[str, Any]] = None, 
               collection: Optional[str] = None, validate: bool = True) -> Model:
@@ -51,29 +100,52 @@ class TormClient:
         """
         Check server health
         
+        Pass ``health_ttl`` to the client to reuse results for that many
+        seconds, so dashboards polling in a loop do not send a request
+        every time.
+        
         Returns:
-            Health status dictionary
+            Health status dictionary (a copy, safe to modify)
         """
-        try:
-            response = self.session.get(f'{self.base_url}/health', timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise ConnectionError(f"Failed to connect to server: {e}")
+        cached = self._health
+        if cached is not None and time.monotonic() - cached[0] < self.health_ttl:
+            return dict(cached[1])
+        
+        with http_errors('connect to server', ConnectionError):
+            response = self.session.get(self.base_url + '/health')
+        result = loads(response.content)
+        self._health = (time.monotonic(), result)
+        return dict(result)
     
     def info(self) -> Dict[str, Any]:
         """
         Get server info
         
+        Results are reused for ``info_ttl`` seconds.
+        
         Returns:
-            Server information dictionary
+            Server information dictionary (a copy, safe to modify)
+        """
+        cached = self._info
+        if cached is not None and time.monotonic() - cached[0] < self.info_ttl:
+            return dict(cached[1])
+        
+        with http_errors('get server info', ConnectionError):
+            response = self.session.get(self.base_url + '/')
+        result = loads(response.content)
+        self._info = (time.monotonic(), result)
+        return dict(result)
+    
+    def invalidate(self, doc_id: Optional[str] = None, collection: Optional[str] = None):
+        """
+        Drop documents from the cache
+        
+        Args:
+            doc_id: Only drop documents with this ID (default: all)
+            collection: Only drop documents from this collection (default: all)
         """
-        try:
-            response = self.session.get(f'{self.base_url}/', timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise ConnectionError(f"Failed to get server info: {e}")
+        if self.cache is not None:
+            self.cache.invalidate(doc_id, collection)
     
     def close(self):
         """Close the client session"""
@@ -1,5 +1,9 @@
 """Exception classes for TORM"""
 
+import contextlib
+import httpx
+from typing import Iterator, Type
+
 
 class TormError(Exception):
     """Base exception for TORM errors"""
@@ -19,3 +23,25 @@ class ConnectionError(TormError):
 class NotFoundError(TormError):
     """Raised when document is not found"""
     pass
+
+
+@contextlib.contextmanager
+def http_errors(action: str, error: Type[TormError] = TormError) -> Iterator[None]:
+    """
+    Re-raise HTTP errors inside the block as TORM errors
+    
+    A 404 response raises NotFoundError unless a more specific error class
+    is given.
+    
+    Args:
+        action: What was being done, used as ``Failed to {action}: ...``
+        error: Exception class to raise
+    """
+    try:
+        yield
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404 and error is TormError:
+            raise NotFoundError(f"Failed to {action}: {e}")
+        raise error(f"Failed to {action}: {e}")
+    except httpx.HTTPError as e:
+        raise error(f"Failed to {action}: {e}")
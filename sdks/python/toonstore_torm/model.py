@@ -1,14 +1,33 @@
 """Model class for TORM"""
 
-import re
-import requests
-from typing import Optional, Dict, Any, List, TYPE_CHECKING
-from .exceptions import ValidationError, NotFoundError, TormError
-from .query import QueryBuilder
+import httpx
+from typing import Optional, Dict, Any, Callable, Iterator, List, Set, TypeVar, TYPE_CHECKING
+from .exceptions import NotFoundError, http_errors
+from .query import QueryBuilder, DocumentList
+from .serialization import dumps, loads
+from .validation import compile_validator
 
 if TYPE_CHECKING:
     from .client import TormClient
 
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Statuses from servers that predate the batch endpoints
+_UNSUPPORTED = (404, 405)
+# Worker threads for the per-document fallback of the batch methods
+_FALLBACK_WORKERS = 16
+
+
+def _map_concurrently(fn: Callable[[T], R], items: List[T]) -> List[R]:
+    """Call fn on every item from a thread pool, keeping the order of items"""
+    # Only servers without the batch endpoints need this, so the import
+    # is kept off the startup path
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=min(_FALLBACK_WORKERS, len(items))) as pool:
+        return list(pool.map(fn, items))
+
 
 class Model:
     """
@@ -29,7 +48,15 @@ class Model:
         self.name = name
         self.collection = collection or name.lower()
         self.schema = schema or {}
+        # Endpoint URLs are built once; per-call work is at most one concatenation
+        self._url = f'{client.base_url}/api/{self.collection}'
+        self._doc_url = self._url + '/'
+        self._count_url = self._url + '/count'
+        self._query_url = self._url + '/query'
+        self._stream_url = self._url + '/stream'
         self.validate_enabled = validate
+        self._validator = compile_validator(self.schema)
+        self._indexed: Set[str] = set()
     
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,35 +69,116 @@ class Model:
             Created document
         """
         if self.validate_enabled and self.schema:
-            self._validate(data)
-        
-        try:
+            self._validator(data)
+        return self._insert(data)
+    
+    def _insert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST one already validated document"""
+        with http_errors('create document'):
             response = self.client.session.post(
-                f'{self.client.base_url}/api/{self.collection}',
-                json={'data': data},
-                timeout=self.client.timeout
+                self._url,
+                content=dumps({'data': data})
             )
-            response.raise_for_status()
-            return response.json().get('data', {})
-        except requests.RequestException as e:
-            raise TormError(f"Failed to create document: {e}")
+        result = loads(response.content)
+        created = result.get('data', {})
+        if self.client.cache is not None and result.get('id'):
+            self.client.cache.set(self.collection, result['id'], created)
+        return created
     
-    def find(self) -> List[Dict[str, Any]]:
+    def create_many(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several documents in a single request
+        
+        Servers without the batch endpoint get one request per document,
+        sent from a thread pool.
+        
+        Args:
+            docs: List of document data
+        
+        Returns:
+            List of created documents
+        """
+        if not docs:
+            return []
+        
+        if self.validate_enabled and self.schema:
+            validate = self._validator
+            for data in docs:
+                validate(data)
+        
+        with http_errors('create documents'):
+            try:
+                response = self.client.session.post(
+                    self._url + '/batch',
+                    content=dumps({'data': docs})
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _UNSUPPORTED:
+                    raise
+                # Older server: one request per document, sent in parallel
+                return _map_concurrently(self._insert, docs)
+        result = loads(response.content)
+        created = result.get('data', [])
+        if self.client.cache is not None:
+            for doc_id, doc in zip(result.get('ids', []), created):
+                self.client.cache.set(self.collection, doc_id, doc)
+        return created
+    
+    def find(
+        self,
+        projection: Optional[List[str]] = None,
+        as_struct: Optional[type] = None
+    ) -> DocumentList:
         """
         Find all documents
         
+        Args:
+            projection: Only return these fields (the document id is always kept)
+            as_struct: Decode documents into this msgspec Struct type
+                (see ``toonstore_torm.structs.DocumentStruct``) instead of dicts
+        
         Returns:
-            List of documents
+            List of documents; ``total`` holds the collection size
         """
-        try:
+        params = {'projection': ','.join(projection)} if projection else None
+        
+        with http_errors('find documents'):
             response = self.client.session.get(
-                f'{self.client.base_url}/api/{self.collection}',
-                timeout=self.client.timeout
+                self._url,
+                params=params
             )
-            response.raise_for_status()
-            return response.json().get('documents', [])
-        except requests.RequestException as e:
-            raise TormError(f"Failed to find documents: {e}")
+        if as_struct is not None:
+            from .structs import decode_documents
+            documents, count = decode_documents(response.content, as_struct)
+            return DocumentList(documents, total=count)
+        
+        result = loads(response.content)
+        return DocumentList(result.get('documents', []), total=result.get('count'))
+    
+    def iter(self, projection: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all documents without loading them into one list
+        
+        Documents are streamed from the server as newline-delimited JSON
+        and parsed one at a time.
+        
+        Args:
+            projection: Only return these fields (the document id is always kept)
+        
+        Yields:
+            Documents
+        """
+        params = {'projection': ','.join(projection)} if projection else None
+        
+        with http_errors('stream documents'):
+            with self.client.session.stream(
+                'GET',
+                self._stream_url,
+                params=params
+            ) as response:
+                for line in response.iter_lines():
+                    if line:
+                        yield loads(line)
     
     def find_by_id(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -82,19 +190,46 @@ class Model:
         Returns:
             Document or None if not found
         """
+        cache = self.client.cache
+        if cache is not None:
+            cached = cache.get(self.collection, doc_id)
+            if cached is not None:
+                return cached
+        
         try:
-            response = self.client.session.get(
-                f'{self.client.base_url}/api/{self.collection}/{doc_id}',
-                timeout=self.client.timeout
-            )
-            if response.status_code == 404:
-                return None
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            if hasattr(e, 'response') and e.response.status_code == 404:
-                return None
-            raise TormError(f"Failed to find document: {e}")
+            with http_errors('find document'):
+                response = self.client.session.get(
+                    self._doc_url + doc_id
+                )
+        except NotFoundError:
+            return None
+        
+        doc = loads(response.content)
+        if cache is not None:
+            cache.set(self.collection, doc_id, doc)
+        return doc
+    
+    def exists(self, doc_id: str) -> bool:
+        """
+        Check whether a document exists without downloading it
+        
+        Args:
+            doc_id: Document ID
+        
+        Returns:
+            True if the document exists
+        """
+        if self.client.cache is not None and self.client.cache.get(self.collection, doc_id):
+            return True
+        
+        try:
+            with http_errors('check document'):
+                self.client.session.head(
+                    self._doc_url + doc_id
+                )
+        except NotFoundError:
+            return False
+        return True
     
     def update(self, doc_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -106,20 +241,32 @@ class Model:
         
         Returns:
             Updated document
+        
+        Raises:
+            NotFoundError: If the document does not exist
         """
         if self.validate_enabled and self.schema:
-            self._validate(data, partial=True)
+            self._validator(data, True)
         
+        # Evict again once the write is done, in case a concurrent read
+        # cached the old document while the PUT was in flight
+        cache = self.client.cache
+        if cache is not None:
+            cache.pop(self.collection, doc_id)
         try:
-            response = self.client.session.put(
-                f'{self.client.base_url}/api/{self.collection}/{doc_id}',
-                json={'data': data},
-                timeout=self.client.timeout
-            )
-            response.raise_for_status()
-            return response.json().get('data', {})
-        except requests.RequestException as e:
-            raise TormError(f"Failed to update document: {e}")
+            with http_errors('update document'):
+                response = self.client.session.put(
+                    self._doc_url + doc_id,
+                    content=dumps({'data': data})
+                )
+        finally:
+            if cache is not None:
+                cache.pop(self.collection, doc_id)
+        result = loads(response.content)
+        if not result.get('success', True):
+            # Older servers answer 200 with success: false for missing documents
+            raise NotFoundError(f"Failed to update document: {result.get('error', doc_id)}")
+        return result.get('data', {})
     
     def delete(self, doc_id: str) -> bool:
         """
@@ -131,15 +278,73 @@ class Model:
         Returns:
             True if deleted successfully
         """
+        if self.client.cache is not None:
+            self.client.cache.pop(self.collection, doc_id)
+        
+        with http_errors('delete document'):
+            response = self.client.session.delete(
+                self._doc_url + doc_id
+            )
+        return loads(response.content).get('success', False)
+    
+    def delete_many(self, ids: Optional[List[str]] = None) -> int:
+        """
+        Delete several documents in one request
+        
+        Servers without the batch endpoint get one request per document,
+        sent from a thread pool.
+        
+        Args:
+            ids: Document IDs to delete; deletes every document when omitted
+        
+        Returns:
+            Number of documents deleted
+        """
+        if ids is None:
+            return self.truncate()
+        
+        if self.client.cache is not None:
+            for doc_id in ids:
+                self.client.cache.pop(self.collection, doc_id)
+        
+        if not ids:
+            return 0
+        
+        with http_errors('delete documents'):
+            try:
+                response = self.client.session.post(
+                    self._url + '/delete',
+                    content=dumps({'ids': ids})
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _UNSUPPORTED:
+                    raise
+                # Older server: one request per document, sent in parallel
+                return sum(_map_concurrently(self._delete_if_exists, ids))
+        return loads(response.content).get('deleted', 0)
+    
+    def _delete_if_exists(self, doc_id: str) -> bool:
+        """Delete one document, returning False if it did not exist"""
         try:
+            return self.delete(doc_id)
+        except NotFoundError:
+            return False
+    
+    def truncate(self) -> int:
+        """
+        Delete every document in the collection with a single request
+        
+        Returns:
+            Number of documents deleted
+        """
+        if self.client.cache is not None:
+            self.client.cache.invalidate(collection=self.collection)
+        
+        with http_errors('truncate collection'):
             response = self.client.session.delete(
-                f'{self.client.base_url}/api/{self.collection}/{doc_id}',
-                timeout=self.client.timeout
+                self._url
             )
-            response.raise_for_status()
-            return response.json().get('success', False)
-        except requests.RequestException as e:
-            raise TormError(f"Failed to delete document: {e}")
+        return loads(response.content).get('deleted', 0)
     
     def count(self) -> int:
         """
@@ -148,15 +353,11 @@ class Model:
         Returns:
             Document count
         """
-        try:
+        with http_errors('count documents'):
             response = self.client.session.get(
-                f'{self.client.base_url}/api/{self.collection}/count',
-                timeout=self.client.timeout
+                self._count_url
             )
-            response.raise_for_status()
-            return response.json().get('count', 0)
-        except requests.RequestException as e:
-            raise TormError(f"Failed to count documents: {e}")
+        return loads(response.content).get('count', 0)
     
     def query(self) -> QueryBuilder:
         """
@@ -165,80 +366,32 @@ class Model:
         Returns:
             QueryBuilder instance
         """
-        return QueryBuilder(self.client, self.collection)
+        return QueryBuilder(self.client, self.collection, self)
+    
+    def _ensure_index(self, field: str):
+        """
+        Ask the server to index a numeric schema field the first time it is filtered on
+        
+        Indexing is best effort: failures are ignored and the query falls
+        back to a full scan.
+        
+        Args:
+            field: Field name
+        """
+        if not self.client.auto_index or field in self._indexed:
+            return
+        if self.schema.get(field, {}).get('type') not in ('int', 'float'):
+            return
+        
+        self._indexed.add(field)
+        try:
+            self.client.session.post(
+                self._url + '/index',
+                content=dumps({'field': field})
+            )
+        except httpx.HTTPError:
+            pass
     
     def _validate(self, data: Dict[str, Any], partial: bool = False):
         """Validate data against schema"""
-        for field, rules in self.schema.items():
-            value = data.get(field)
-            
-            # Required check
-            if rules.get('required', False) and not partial:
-                if value is None:
-                    raise ValidationError(f"Field '{field}' is required")
-            
-            # Skip if value is None and not required
-            if value is None:
-                continue
-            
-            # Type check
-            expected_type = rules.get('type')
-            if expected_type:
-                if not self._check_type(value, expected_type):
-                    raise ValidationError(f"Field '{field}' must be of type {expected_type}")
-            
-            # String validations
-            if isinstance(value, str):
-                if 'min_length' in rules and len(value) < rules['min_length']:
-                    raise ValidationError(
-                        f"Field '{field}' must be at least {rules['min_length']} characters"
-                    )
-                if 'max_length' in rules and len(value) > rules['max_length']:
-                    raise ValidationError(
-                        f"Field '{field}' must be at most {rules['max_length']} characters"
-                    )
-                if rules.get('email', False) and not self._is_email(value):
-                    raise ValidationError(f"Field '{field}' must be a valid email")
-                if rules.get('url', False) and not self._is_url(value):
-                    raise ValidationError(f"Field '{field}' must be a valid URL")
-                if 'pattern' in rules and not re.match(rules['pattern'], value):
-                    raise ValidationError(f"Field '{field}' does not match pattern")
-            
-            # Number validations
-            if isinstance(value, (int, float)):
-                if 'min' in rules and value < rules['min']:
-                    raise ValidationError(f"Field '{field}' must be at least {rules['min']}")
-                if 'max' in rules and value > rules['max']:
-                    raise ValidationError(f"Field '{field}' must be at most {rules['max']}")
-            
-            # Custom validation
-            if 'validate' in rules:
-                validator = rules['validate']
-                if callable(validator) and not validator(value):
-                    raise ValidationError(f"Field '{field}' failed custom validation")
-    
-    @staticmethod
-    def _check_type(value: Any, expected_type: str) -> bool:
-        """Check if value matches expected type"""
-        type_map = {
-            'str': str,
-            'int': int,
-            'float': float,
-            'bool': bool,
-            'list': list,
-            'dict': dict,
-        }
-        expected_class = type_map.get(expected_type)
-        if expected_class:
-            return isinstance(value, expected_class)
-        return True
-    
-    @staticmethod
-    def _is_email(value: str) -> bool:
-        """Check if value is a valid email"""
-        return bool(re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', value))
-    
-    @staticmethod
-    def _is_url(value: str) -> bool:
-        """Check if value is a valid URL"""
-        return bool(re.match(r'^https?://.+', value))
+        self._validator(data, partial)
@@ -1,15 +1,56 @@
 """Query builder for TORM"""
 
-import requests
-from typing import List, Dict, Any, Optional, Literal, TYPE_CHECKING
-from .exceptions import TormError
+import operator as _op
+from typing import List, Dict, Any, Iterator, Optional, Literal, TYPE_CHECKING
+from .exceptions import http_errors
+from .serialization import dumps, loads
 
 if TYPE_CHECKING:
     from .client import TormClient
+    from .model import Model
 
-QueryOperator = Literal['eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'contains', 'in', 'not_in']
+QueryOperator = Literal[
+    'eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'between', 'contains', 'in', 'not_in'
+]
 SortOrder = Literal['asc', 'desc']
 
+# Client-side implementation of each operator, called as fn(doc_value, filter_value)
+_OPS = {
+    'eq': _op.eq,
+    'ne': _op.ne,
+    'gt': _op.gt,
+    'gte': _op.ge,
+    'lt': _op.lt,
+    'lte': _op.le,
+    'between': lambda a, b: b[0] <= a <= b[1],
+    'contains': lambda a, b: b in str(a),
+    'in': lambda a, b: a in b,
+    'not_in': lambda a, b: a not in b,
+}
+
+
+def _never(doc_value: Any, filter_value: Any) -> bool:
+    return False
+
+
+class DocumentList(List[Dict[str, Any]]):
+    """
+    List of documents that also carries the server-side match count
+    
+    ``total`` is the number of matching documents before skip/limit were
+    applied, so a page of results and the overall count come back in one
+    request.
+    """
+    
+    def __init__(self, documents: List[Dict[str, Any]], total: Optional[int] = None):
+        super().__init__(documents)
+        self.total = len(documents) if total is None else total
+    
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        """The documents as a plain list"""
+        return list(self)
+
 
 class QueryBuilder:
     """
@@ -24,14 +65,27 @@ class QueryBuilder:
         ...     .exec()
     """
     
-    def __init__(self, client: 'TormClient', collection: str):
+    def __init__(self, client: 'TormClient', collection: str, model: Optional['Model'] = None):
         self.client = client
         self.collection = collection
+        self.model = model
+        if model is not None:
+            self._url = model._query_url
+            self._count_url = model._count_url
+            self._stream_url = model._stream_url
+        else:
+            base_url = f'{client.base_url}/api/{collection}'
+            self._url = base_url + '/query'
+            self._count_url = base_url + '/count'
+            self._stream_url = base_url + '/stream'
         self.filters: List[Dict[str, Any]] = []
         self.sort_field: Optional[str] = None
         self.sort_order: SortOrder = 'asc'
         self.limit_value: Optional[int] = None
         self.skip_value: Optional[int] = None
+        self.projection: Optional[List[str]] = None
+        # Re-check filters and sort order locally (for servers that ignore them)
+        self.client_side = False
     
     def filter(self, field: str, operator: QueryOperator, value: Any) -> 'QueryBuilder':
         """
@@ -106,89 +160,200 @@ class QueryBuilder:
         self.skip_value = n
         return self
     
-    def exec(self) -> List[Dict[str, Any]]:
+    def project(self, fields: List[str]) -> 'QueryBuilder':
         """
-        Execute the query
+        Only return the given fields (the document id is always kept)
+        
+        Args:
+            fields: Field names to return
         
         Returns:
-            List of matching documents
+            Self for chaining
         """
-        query_data: Dict[str, Any] = {}
+        self.projection = list(fields)
+        return self
+    
+    def exec(self, as_struct: Optional[type] = None) -> DocumentList:
+        """
+        Execute the query
         
-        if self.filters:
-            query_data['filters'] = self.filters
-        if self.sort_field:
-            query_data['sort'] = {'field': self.sort_field, 'order': self.sort_order}
-        if self.limit_value is not None:
-            query_data['limit'] = self.limit_value
-        if self.skip_value is not None:
-            query_data['skip'] = self.skip_value
+        Args:
+            as_struct: Decode documents into this msgspec Struct type
+                (see ``toonstore_torm.structs.DocumentStruct``) instead of
+                dicts; ignored when ``client_side`` is set
+        
+        Returns:
+            List of matching documents; ``total`` counts matches before skip/limit
+        """
+        self._ensure_indexes()
+        filters = self._compiled_filters()
+        query_data = self._query_data(filters)
         
-        try:
+        with http_errors('execute query'):
             response = self.client.session.post(
-                f'{self.client.base_url}/api/{self.collection}/query',
-                json=query_data,
-                timeout=self.client.timeout
+                self._url,
+                content=dumps(query_data)
             )
-            response.raise_for_status()
-            documents = response.json().get('documents', [])
-            
-            # Apply client-side filtering
-            if self.filters:
-                documents = [doc for doc in documents if self._matches_filters(doc)]
-            
-            # Apply client-side sorting
-            if self.sort_field:
-                documents.sort(
-                    key=lambda x: x.get(self.sort_field, ''),
-                    reverse=(self.sort_order == 'desc')
-                )
-            
-            return documents
-            
-        except requests.RequestException as e:
-            raise TormError(f"Failed to execute query: {e}")
+        if as_struct is not None and not self.client_side:
+            from .structs import decode_documents
+            documents, total = decode_documents(response.content, as_struct)
+            return DocumentList(documents, total=total)
+        
+        result = loads(response.content)
+        documents = result.get('documents', [])
+        
+        if self.client_side:
+            documents = self._apply_client_side(documents, filters)
+        
+        return DocumentList(documents, total=result.get('total'))
+    
+    def iter(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the results without loading the whole response at once
+        
+        The server streams matches as newline-delimited JSON, which is parsed
+        one document at a time. Use this instead of ``exec()`` for large
+        result sets.
+        
+        Yields:
+            Matching documents
+        """
+        if self.client_side:
+            # Sorting locally needs every match first
+            yield from self.exec()
+            return
+        
+        self._ensure_indexes()
+        query_data = self._query_data(self._compiled_filters())
+        
+        with http_errors('stream query results'):
+            with self.client.session.stream(
+                'POST',
+                self._stream_url,
+                content=dumps(query_data)
+            ) as response:
+                for line in response.iter_lines():
+                    if line:
+                        yield loads(line)
     
     def count(self) -> int:
         """
         Count matching documents
         
+        The server counts the matches without sending any documents back;
+        skip and limit are applied to that count.
+        
         Returns:
             Number of matching documents
         """
-        return len(self.exec())
+        if self.client_side:
+            return len(self.exec())
+        
+        self._ensure_indexes()
+        query_data: Dict[str, Any] = {}
+        filters = self._compiled_filters()
+        if filters:
+            query_data['filters'] = filters
+        
+        with http_errors('count documents'):
+            response = self.client.session.post(
+                self._count_url,
+                content=dumps(query_data)
+            )
+        count = loads(response.content).get('count', 0)
+        count = max(count - (self.skip_value or 0), 0)
+        if self.limit_value is not None:
+            count = min(count, self.limit_value)
+        return count
     
-    def _matches_filters(self, doc: Dict[str, Any]) -> bool:
-        """Check if document matches all filters"""
+    def _apply_client_side(
+        self, documents: List[Dict[str, Any]], filters: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Filter, sort and project server results again in Python"""
+        if filters:
+            checks = self._resolve_filters(filters)
+            documents = [doc for doc in documents if self._matches_filters(doc, checks)]
+        
+        if self.sort_field:
+            documents.sort(
+                key=lambda x: x.get(self.sort_field, ''),
+                reverse=(self.sort_order == 'desc')
+            )
+        
+        # Drop fields that were only fetched for client-side filtering
+        if self.projection is not None:
+            keep = set(self.projection) | {'id'}
+            documents = [
+                {k: v for k, v in doc.items() if k in keep} for doc in documents
+            ]
+        return documents
+    
+    def _ensure_indexes(self) -> None:
+        """Ask the server to index the filtered fields before the query runs"""
+        if self.model is not None:
+            for f in self.filters:
+                self.model._ensure_index(f['field'])
+    
+    def _query_data(self, filters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Request body for the query and stream endpoints"""
+        query_data: Dict[str, Any] = {}
+        
+        if filters:
+            query_data['filters'] = filters
+        if self.sort_field:
+            query_data['sort'] = {'field': self.sort_field, 'order': self.sort_order}
+        if self.limit_value is not None:
+            query_data['limit'] = self.limit_value
+        if self.skip_value is not None:
+            query_data['skip'] = self.skip_value
+        if self.projection is not None:
+            query_data['projection'] = (
+                self._requested_fields() if self.client_side else self.projection
+            )
+        return query_data
+    
+    def _requested_fields(self) -> List[str]:
+        """Projected fields plus those needed by client-side filtering and sorting"""
+        fields = list(self.projection or [])
+        for name in [f['field'] for f in self.filters] + [self.sort_field]:
+            if name and name not in fields:
+                fields.append(name)
+        return fields
+    
+    def _compiled_filters(self) -> List[Dict[str, Any]]:
+        """Filters in wire format, with same-field gte/lte pairs fused into one 'between'"""
+        compiled: List[Dict[str, Any]] = []
+        pending: Dict[tuple, int] = {}
+        
         for f in self.filters:
-            field = f['field']
             operator = f['operator']
-            value = f['value']
-            doc_value = doc.get(field)
-            
-            if not self._matches_filter(doc_value, operator, value):
-                return False
-        return True
+            if operator in ('gte', 'lte'):
+                other = 'lte' if operator == 'gte' else 'gte'
+                index = pending.pop((f['field'], other), None)
+                if index is not None:
+                    bound = compiled[index]['value']
+                    low, high = (f['value'], bound) if operator == 'gte' else (bound, f['value'])
+                    compiled[index] = {
+                        'field': f['field'],
+                        'operator': 'between',
+                        'value': [low, high]
+                    }
+                    continue
+                pending[(f['field'], operator)] = len(compiled)
+            compiled.append(f)
+        
+        return compiled
     
     @staticmethod
-    def _matches_filter(doc_value: Any, operator: str, filter_value: Any) -> bool:
-        """Check if value matches filter"""
-        if operator == 'eq':
-            return doc_value == filter_value
-        elif operator == 'ne':
-            return doc_value != filter_value
-        elif operator == 'gt':
-            return doc_value > filter_value
-        elif operator == 'gte':
-            return doc_value >= filter_value
-        elif operator == 'lt':
-            return doc_value < filter_value
-        elif operator == 'lte':
-            return doc_value <= filter_value
-        elif operator == 'contains':
-            return filter_value in str(doc_value)
-        elif operator == 'in':
-            return doc_value in filter_value
-        elif operator == 'not_in':
-            return doc_value not in filter_value
-        return False
+    def _resolve_filters(filters: List[Dict[str, Any]]) -> List[tuple]:
+        """Look up each filter's operator once, as (field, fn, value) tuples"""
+        return [(f['field'], _OPS.get(f['operator'], _never), f['value']) for f in filters]
+    
+    @staticmethod
+    def _matches_filters(doc: Dict[str, Any], checks: List[tuple]) -> bool:
+        """Check if document matches all resolved filters"""
+        get = doc.get
+        for field, fn, value in checks:
+            if not fn(get(field), value):
+                return False
+        return True
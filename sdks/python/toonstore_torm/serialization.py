@@ -0,0 +1,50 @@
+"""JSON serialization helpers for TORM"""
+
+import json
+import orjson
+from typing import Any
+from .exceptions import TormError
+
+# numpy arrays and scalars in documents are encoded natively, without a
+# tolist() round trip (orjson does not import numpy for this). Non-string
+# dict keys are converted to strings, as the stdlib json module does.
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to a JSON request body
+    
+    Args:
+        obj: Object to serialize
+    
+    Returns:
+        UTF-8 encoded JSON
+    
+    Raises:
+        TormError: If the object cannot be serialized
+    """
+    try:
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+    except orjson.JSONEncodeError as e:
+        # orjson rejects integers wider than 64 bits, the stdlib does not
+        try:
+            return json.dumps(obj, separators=(',', ':')).encode()
+        except (TypeError, ValueError):
+            raise TormError(f"Failed to serialize: {e}") from e
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse a JSON response body
+    
+    Args:
+        data: Raw response content
+    
+    Returns:
+        Parsed object
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        raise TormError(f"Invalid JSON response: {e}")
@@ -0,0 +1,70 @@
+"""Typed result structs for TORM (requires the optional ``msgspec`` package)"""
+
+import msgspec
+from typing import Any, Dict, List, Optional, Tuple, Type
+from .exceptions import TormError
+
+
+class DocumentStruct(msgspec.Struct):
+    """
+    Base class for typed query results
+    
+    Documents decoded into a struct are built directly by msgspec's C
+    decoder instead of going through intermediate dicts. Item access is
+    kept so code written against dict results keeps working.
+    
+    Example:
+        >>> class UserStruct(DocumentStruct):
+        ...     id: str
+        ...     name: str
+        ...     age: int = 0
+        >>> users = User.find(as_struct=UserStruct)
+        >>> users[0].name == users[0]['name']
+        True
+    """
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+_decoders: Dict[Type[Any], msgspec.json.Decoder] = {}
+
+
+def decode_documents(data: bytes, struct_type: Type[Any]) -> Tuple[List[Any], Optional[int]]:
+    """
+    Decode a ``{"documents": [...], "count": n}`` response into structs
+    
+    Query responses also carry ``total``, the match count before
+    skip/limit, which is returned instead of ``count`` when present.
+    
+    Args:
+        data: Raw response content
+        struct_type: msgspec Struct type for each document
+    
+    Returns:
+        Tuple of (documents, total)
+    """
+    decoder = _decoders.get(struct_type)
+    if decoder is None:
+        response_type = msgspec.defstruct(
+            f'{struct_type.__name__}List',
+            [
+                ('documents', List[struct_type], []),
+                ('count', Optional[int], None),
+                ('total', Optional[int], None),
+            ],
+        )
+        decoder = _decoders[struct_type] = msgspec.json.Decoder(response_type)
+    
+    try:
+        result = decoder.decode(data)
+    except msgspec.DecodeError as e:
+        raise TormError(f"Invalid JSON response: {e}")
+    total = result.total if result.total is not None else result.count
+    return result.documents, total
@@ -0,0 +1,248 @@
+"""Schema validation for TORM"""
+
+import functools
+import re
+from typing import Any, Callable, Dict, List, Tuple
+from .exceptions import ValidationError
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    from . import _speedups
+except ImportError:
+    _speedups = None
+
+Validator = Callable[[Dict[str, Any], bool], None]
+
+_TYPE_MAP = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: Any) -> Any:
+    """
+    Compile a validation regex, preferring RE2 when it is installed
+    
+    RE2 matches in linear time, so hostile input cannot trigger
+    catastrophic backtracking. Patterns RE2 does not support (e.g.
+    backreferences) and already-compiled patterns fall back to ``re``.
+    Results are cached, so models sharing a pattern share one compiled
+    object.
+    """
+    if re2 is not None and isinstance(pattern, str):
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+_EMAIL_RE = _compile_pattern(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+_URL_RE = _compile_pattern(r'^https?://.+')
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Build a validation function specialized for a schema
+    
+    Uses the native ``_speedups`` extension when it was built at install
+    time and falls back to generated Python source otherwise. Both raise
+    the same errors in the same order.
+    
+    Args:
+        schema: Validation schema dictionary
+    
+    Returns:
+        Function taking ``(data, partial=False)`` that raises ValidationError
+    """
+    if _speedups is not None:
+        return _native_validator(schema)
+    return _generate_validator(schema)
+
+
+# Check kinds understood by _speedups.c; keep the numbering in sync
+_CHECK_TYPE = 0
+_CHECK_MIN_LENGTH = 1
+_CHECK_MAX_LENGTH = 2
+_CHECK_MATCH = 3
+_CHECK_MIN = 4
+_CHECK_MAX = 5
+_CHECK_CUSTOM = 6
+
+
+def _native_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Flatten a schema into the check table walked by ``_speedups.validate``
+    
+    Each field becomes ``(name, required, required_message, checks)`` and
+    each check a ``(kind, operand, message)`` tuple, in the same order as
+    the generated Python validator runs them.
+    """
+    fields = []
+    
+    for field, rules in schema.items():
+        checks: List[Tuple[int, Any, str]] = []
+        
+        expected_type = rules.get('type')
+        expected_class = _TYPE_MAP.get(expected_type) if expected_type else None
+        if expected_class:
+            checks.append((
+                _CHECK_TYPE, expected_class, f"Field '{field}' must be of type {expected_type}"
+            ))
+        
+        if 'min_length' in rules:
+            checks.append((
+                _CHECK_MIN_LENGTH, rules['min_length'],
+                f"Field '{field}' must be at least {rules['min_length']} characters"
+            ))
+        if 'max_length' in rules:
+            checks.append((
+                _CHECK_MAX_LENGTH, rules['max_length'],
+                f"Field '{field}' must be at most {rules['max_length']} characters"
+            ))
+        if rules.get('email', False):
+            checks.append((_CHECK_MATCH, _EMAIL_RE.match, f"Field '{field}' must be a valid email"))
+        if rules.get('url', False):
+            checks.append((_CHECK_MATCH, _URL_RE.match, f"Field '{field}' must be a valid URL"))
+        if 'pattern' in rules:
+            checks.append((
+                _CHECK_MATCH, _compile_pattern(rules['pattern']).match,
+                f"Field '{field}' does not match pattern"
+            ))
+        
+        if 'min' in rules:
+            checks.append((_CHECK_MIN, rules['min'], f"Field '{field}' must be at least {rules['min']}"))
+        if 'max' in rules:
+            checks.append((_CHECK_MAX, rules['max'], f"Field '{field}' must be at most {rules['max']}"))
+        
+        if callable(rules.get('validate')):
+            checks.append((
+                _CHECK_CUSTOM, rules['validate'], f"Field '{field}' failed custom validation"
+            ))
+        
+        required = bool(rules.get('required', False))
+        if checks or required:
+            fields.append((field, required, f"Field '{field}' is required", tuple(checks)))
+    
+    return functools.partial(_speedups.validate, (ValidationError, tuple(fields)))
+
+
+def _generate_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Generate straight-line Python source for a schema
+    
+    The schema is walked once, so validating a document does no rule
+    lookups or dispatch on the schema dict. Rule values, compiled regexes
+    and error messages are bound as constants of the generated function.
+    """
+    namespace: Dict[str, Any] = {'ValidationError': ValidationError}
+    lines = ['def validate(data, partial=False):', '    get = data.get']
+    
+    def const(value: Any) -> str:
+        name = f'_c{len(namespace)}'
+        namespace[name] = value
+        return name
+    
+    def fail(message: str) -> str:
+        return f'raise ValidationError({const(message)})'
+    
+    for field, rules in schema.items():
+        checks: List[str] = []
+        
+        # Type check
+        expected_type = rules.get('type')
+        expected_class = _TYPE_MAP.get(expected_type) if expected_type else None
+        if expected_class:
+            checks.append(
+                f'if not isinstance(value, {const(expected_class)}): '
+                + fail(f"Field '{field}' must be of type {expected_type}")
+            )
+        
+        # String validations
+        string_checks: List[str] = []
+        if 'min_length' in rules:
+            string_checks.append(
+                f"if len(value) < {const(rules['min_length'])}: "
+                + fail(f"Field '{field}' must be at least {rules['min_length']} characters")
+            )
+        if 'max_length' in rules:
+            string_checks.append(
+                f"if len(value) > {const(rules['max_length'])}: "
+                + fail(f"Field '{field}' must be at most {rules['max_length']} characters")
+            )
+        if rules.get('email', False):
+            string_checks.append(
+                f'if not {const(_EMAIL_RE.match)}(value): '
+                + fail(f"Field '{field}' must be a valid email")
+            )
+        if rules.get('url', False):
+            string_checks.append(
+                f'if not {const(_URL_RE.match)}(value): '
+                + fail(f"Field '{field}' must be a valid URL")
+            )
+        if 'pattern' in rules:
+            string_checks.append(
+                f"if not {const(_compile_pattern(rules['pattern']).match)}(value): "
+                + fail(f"Field '{field}' does not match pattern")
+            )
+        if string_checks:
+            if expected_class is str:
+                checks.extend(string_checks)
+            else:
+                checks.append('if isinstance(value, str):')
+                checks.extend('    ' + check for check in string_checks)
+        
+        # Number validations
+        number_checks: List[str] = []
+        if 'min' in rules:
+            number_checks.append(
+                f"if value < {const(rules['min'])}: "
+                + fail(f"Field '{field}' must be at least {rules['min']}")
+            )
+        if 'max' in rules:
+            number_checks.append(
+                f"if value > {const(rules['max'])}: "
+                + fail(f"Field '{field}' must be at most {rules['max']}")
+            )
+        if number_checks:
+            if expected_class in (int, float, bool):
+                checks.extend(number_checks)
+            else:
+                checks.append('if isinstance(value, (int, float)):')
+                checks.extend('    ' + check for check in number_checks)
+        
+        # Custom validation
+        if callable(rules.get('validate')):
+            checks.append(
+                f"if not {const(rules['validate'])}(value): "
+                + fail(f"Field '{field}' failed custom validation")
+            )
+        
+        required = rules.get('required', False)
+        if not checks and not required:
+            continue
+        
+        lines.append(f'    value = get({field!r})')
+        if required and checks:
+            lines.append('    if value is None:')
+            lines.append('        if not partial: ' + fail(f"Field '{field}' is required"))
+            lines.append('    else:')
+        elif required:
+            lines.append(
+                '    if value is None and not partial: ' + fail(f"Field '{field}' is required")
+            )
+        else:
+            lines.append('    if value is not None:')
+        lines.extend('        ' + check for check in checks)
+    
+    exec(compile('\n'.join(lines), '<torm validator>', 'exec'), namespace)
+    return namespace['validate']